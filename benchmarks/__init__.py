@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准脚本集合（非单元测试，按需手动运行；结果等价性校验见 tests/）
+
+    python -m benchmarks.startup             # 冷启动耗时与导入耗时预算
+    python -m benchmarks.docx_parse          # 流式 docx 解析 vs python-docx
+    python -m benchmarks.scaling             # 合成条款库（100–100k 行）上的分阶段耗时
+    python -m benchmarks.content_similarity  # 内容相似度：difflib vs MinHash
+    python -m benchmarks.normalize           # 编译后的文本规范化 vs 原逐步实现
+    python -m benchmarks.config_scan         # ClauseConfig 字典扫描：自动机 vs 逐键线性扫描
+
+benchmarks.corpus 生成合成条款库与客户文档，benchmarks.common 为脚本与 tests/ 共用的辅助函数。
+"""
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+基准脚本与 tests/ 共用的辅助函数：样本路径、离线运行设置、样本条款库、随机删改文本、
+MatchResult 逐字段比较，以及校验结果的 ✓ / ✗ 输出。
+脚本以 python -m benchmarks.<名称> 在仓库根目录运行，根目录已在 sys.path 中；
+此处不在模块级导入 clause_diff_core，冷启动基准等脚本导入本模块不会带入重型依赖。
+"""
+
+import os
+import random
+from dataclasses import fields
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_LIBRARY = os.path.join(ROOT, "clause_library.xlsx")
+SAMPLE_DOCUMENTS = ("client_cn.docx", "client_en.docx")
+
+
+def sample_path(name: str) -> str:
+    """仓库自带样本文件的绝对路径"""
+    return os.path.join(ROOT, name)
+
+
+def offline():
+    """关闭条款库缓存、匹配结果缓存与在线翻译：结果只取决于当前代码与配置，也不读写用户缓存目录"""
+    from clause_diff_core import ClauseConfig, ClauseMatcherLogic
+    ClauseConfig.LIBRARY_CACHE = False
+    ClauseConfig.MATCH_CACHE = False
+    ClauseMatcherLogic.translator = None
+
+
+def load_library():
+    """按比对流程读取样本条款库，返回 LibraryIndex"""
+    from clause_diff_core import ClauseMatchPipeline
+    return ClauseMatchPipeline("", SAMPLE_LIBRARY, "").load_library()
+
+
+def edit(text: str, rng: random.Random, ratio: float = 0.15, truncate: float = 0.0) -> str:
+    """随机删改约 ratio 比例的字符得到近似文本；truncate 为再截断成随机长度前缀的概率"""
+    chars = list(text)
+    for _ in range(int(len(chars) * ratio)):
+        if not chars:
+            break
+        i = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            del chars[i]
+        else:
+            chars[i] = rng.choice(text)
+    if truncate and chars and rng.random() < truncate:
+        chars = chars[:rng.randint(1, len(chars))]
+    return "".join(chars)
+
+
+def diff_results(expected: list, actual: list, label: str) -> List[str]:
+    """逐条比较两组 MatchResult 的全部字段，每条只报告第一个不同的字段"""
+    from clause_diff_core import MatchResult
+    failures = []
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        for f in fields(MatchResult):
+            if getattr(a, f.name) != getattr(b, f.name):
+                failures.append(f"{label} 第 {i + 1} 条 {f.name}: 期望 {getattr(a, f.name)!r}，实际 {getattr(b, f.name)!r}")
+                break
+    if len(expected) != len(actual):
+        failures.append(f"{label}: 条数不一致 {len(expected)} / {len(actual)}")
+    return failures
+
+
+def report(failures: List[str], success: str) -> int:
+    """逐条输出失败项（✗），全部通过时输出 success（✓）；返回进程退出码"""
+    for msg in failures:
+        print(f"✗ {msg}")
+    if not failures:
+        print(f"✓ {success}")
+    return 1 if failures else 0
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+ClauseConfig 字典扫描基准：Aho-Corasick 自动机 vs 原逐键 `in` 线性扫描
+- 四处字典查找：extract_keywords（KEYWORD_EXTRACT_MAP）、check_semantic_alias（SEMANTIC_ALIAS_MAP）、
+  find_exact_clause_target（EXACT_CLAUSE_MAP）、glossary_translate 的部分匹配（CLIENT_EN_CN_MAP）
+- 字典按 --scales 倍数扩充：原字典在前，其后追加由原键的词 / 字重组出的合成键，贴近真实术语表的规模
+- 查询文本：两份客户文档的全部标题（英文标题另按翻译前的标准化形式查询）与条款库全部名称
+- 两种实现的结果逐条比较，任一不一致即非零退出；输出每次调用的平均耗时（µs，不含自动机构建）
+
+用法:
+    python -m benchmarks.config_scan [--scales 1 4 16] [--seed 0]
+"""
+
+import sys
+import time
+import random
+import argparse
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from benchmarks.common import SAMPLE_DOCUMENTS, SAMPLE_LIBRARY, report, sample_path
+from clause_diff_core import ClauseConfig, ClauseMatcherLogic
+
+
+# ---- 参考实现（改写前的逐键扫描，逐字保留）----
+def ref_extract_keywords(text: str) -> Set[str]:
+    keywords = set()
+    text_lower = text.lower()
+    for core, variants in ClauseConfig.KEYWORD_EXTRACT_MAP.items():
+        for v in variants:
+            if v.lower() in text_lower:
+                keywords.add(core)
+                break
+    return keywords
+
+
+def ref_check_semantic_alias(title: str) -> Optional[str]:
+    title_clean = title.replace(" ", "").lower()
+    for alias, target in ClauseConfig.SEMANTIC_ALIAS_MAP.items():
+        if alias.lower() in title_clean:
+            return target
+    return None
+
+
+def ref_find_exact_clause_target(title: str, title_clean: str) -> Optional[str]:
+    for src, tgt in ClauseConfig.EXACT_CLAUSE_MAP.items():
+        if src in title or src in title_clean:
+            return tgt
+    return None
+
+
+def ref_partial_glossary_hit(title_norm: str) -> Optional[str]:
+    for eng, chn in ClauseConfig.CLIENT_EN_CN_MAP.items():
+        if eng in title_norm or title_norm in eng:
+            return chn
+    return None
+
+
+def _synthetic(keys: List[str], count: int, rng: random.Random, by_word: bool) -> List[str]:
+    """由原键的词（英文）或字（中文）随机重组出 count 个不与原键重复的新键"""
+    units = sorted({u for k in keys for u in (k.split() if by_word else k)})
+    sep = " " if by_word else ""
+    existing, extra = set(keys), []
+    while len(extra) < count:
+        key = sep.join(rng.choice(units) for _ in range(rng.randint(3, 5)))
+        if key not in existing:
+            existing.add(key)
+            extra.append(key)
+    return extra
+
+
+def scaled_dicts(scale: int, seed: int) -> Dict[str, Dict]:
+    """原字典扩充到约 scale 倍；新键追加在后，原键的命中顺序不变"""
+    rng = random.Random(seed)
+    glossary = dict(ClauseConfig.CLIENT_EN_CN_MAP)
+    targets = list(glossary.values())
+    for key in _synthetic(list(glossary), len(glossary) * (scale - 1), rng, by_word=True):
+        glossary[key] = rng.choice(targets)
+    alias = dict(ClauseConfig.SEMANTIC_ALIAS_MAP)
+    targets = list(alias.values())
+    for key in _synthetic(list(alias), len(alias) * (scale - 1), rng, by_word=False):
+        alias[key] = rng.choice(targets)
+    keyword = {core: list(variants) for core, variants in ClauseConfig.KEYWORD_EXTRACT_MAP.items()}
+    variants = [v for vs in keyword.values() for v in vs]
+    for i, key in enumerate(_synthetic(variants, len(variants) * (scale - 1), rng, by_word=False)):
+        keyword.setdefault(f"合成{i // 4}", []).append(key)
+    exact = dict(ClauseConfig.EXACT_CLAUSE_MAP)
+    targets = list(exact.values())
+    for key in _synthetic(list(exact), len(exact) * (scale - 1), rng, by_word=False):
+        exact[key] = rng.choice(targets)
+    return {'CLIENT_EN_CN_MAP': glossary, 'SEMANTIC_ALIAS_MAP': alias,
+            'KEYWORD_EXTRACT_MAP': keyword, 'EXACT_CLAUSE_MAP': exact}
+
+
+def sample_titles() -> Tuple[List[str], List[str]]:
+    """(全部中文 / 英文标题, 英文标题的标准化形式)"""
+    from openpyxl import load_workbook
+    logic = ClauseMatcherLogic
+    wb = load_workbook(SAMPLE_LIBRARY, read_only=True)
+    titles = [str(row[0]).strip() for row in wb.active.iter_rows(min_row=2, values_only=True)
+              if row and row[0] and str(row[0]).strip()]
+    wb.close()
+    english = []
+    for doc in SAMPLE_DOCUMENTS:
+        clauses, _ = logic.parse_docx(sample_path(doc))
+        for clause in clauses:
+            titles.append(clause.title)
+            if logic.is_english(clause.title):
+                english.append(logic.normalize_text(clause.title))
+    return titles, english
+
+
+def per_call(fn: Callable, args: List[tuple], repeat: int) -> float:
+    """平均每次调用耗时（µs）"""
+    for a in args:
+        fn(*a)   # 预热：构建自动机
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for a in args:
+            fn(*a)
+    return (time.perf_counter() - start) / (repeat * len(args)) * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ClauseConfig 字典扫描基准")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16], help="字典扩充倍数")
+    parser.add_argument("--repeat", type=int, default=20, help="每组查询重复次数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args(argv)
+
+    logic = ClauseMatcherLogic
+    titles, english = sample_titles()
+    cleaned = [(t, logic.clean_title(t)) for t in titles]
+    cases = [
+        ("extract_keywords", 'KEYWORD_EXTRACT_MAP', ref_extract_keywords, logic.extract_keywords,
+         [(t,) for t in titles]),
+        ("check_semantic_alias", 'SEMANTIC_ALIAS_MAP', ref_check_semantic_alias, logic.check_semantic_alias,
+         [(t,) for t in titles]),
+        ("find_exact_clause_target", 'EXACT_CLAUSE_MAP', ref_find_exact_clause_target,
+         logic.find_exact_clause_target, cleaned),
+        ("partial_glossary_hit", 'CLIENT_EN_CN_MAP', ref_partial_glossary_hit, logic._partial_glossary_hit,
+         [(t,) for t in english]),
+    ]
+
+    original = {name: getattr(ClauseConfig, name) for _, name, _, _, _ in cases}
+    failures = []
+    print(f"{'查找':<26}{'倍数':>4}{'键数':>7}{'查询数':>7}{'线性扫描(µs)':>14}{'自动机(µs)':>12}{'加速':>7}")
+    try:
+        for scale in args.scales:
+            # 整体替换字典，自动机随之重建
+            for name, mapping in scaled_dicts(scale, args.seed).items():
+                setattr(ClauseConfig, name, mapping)
+            for label, name, ref, new, queries in cases:
+                mapping = getattr(ClauseConfig, name)
+                n_keys = sum(map(len, mapping.values())) if name == 'KEYWORD_EXTRACT_MAP' else len(mapping)
+                for q in queries:
+                    expected, actual = ref(*q), new(*q)
+                    if expected != actual:
+                        failures.append(f"{label} ×{scale} {q!r}: 线性扫描 {expected!r}，自动机 {actual!r}")
+                        break
+                t_ref = per_call(ref, queries, args.repeat)
+                t_new = per_call(new, queries, args.repeat)
+                print(f"{label:<26}{scale:>4}{n_keys:>8}{len(queries):>8}{t_ref:>14.2f}{t_new:>12.2f}"
+                      f"{t_ref / t_new:>7.1f}x")
+    finally:
+        for name, mapping in original.items():
+            setattr(ClauseConfig, name, mapping)
+
+    return report(failures, "自动机与线性扫描结果逐条一致")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
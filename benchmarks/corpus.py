@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+合成语料生成：以仓库自带样本为种子，生成任意规模的条款库与客户文档
+- 条款库：以 clause_library.xlsx 为种子，按“险种前缀 + 附加 + 条款主体 + 版本后缀”重组名称，
+  内容由随机种子条款的句子拼接，得到大量相互近似的条款（贴近真实条款库的重复度）；
+  rows 不超过种子条数时直接抽样种子行，版式（表头行、列顺序）与原工作簿一致
+- 客户文档：以 client_cn.docx / client_en.docx 解析出的条款为种子，抽样并对部分标题做轻微改写；
+  title_only=True 时只写标题。条款之间以空段落分隔，parse_docx 按空行切分
+- 同一组参数与随机种子生成的文件完全相同
+
+用法:
+    python -m benchmarks.corpus 输出目录 [--rows 10000] [--clauses 200] [--seed 0]
+"""
+
+import os
+import re
+import sys
+import random
+import zipfile
+import argparse
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from benchmarks.common import SAMPLE_LIBRARY as SEED_LIBRARY, sample_path
+
+SEED_DOCS = {"cn": sample_path("client_cn.docx"), "en": sample_path("client_en.docx")}
+
+LIBRARY_HEADER = ['条款名称', '注册号', '条款内容']
+_VERSION = re.compile(r"[（(][^（()）]*[)）]\s*$")
+_SUFFIXES = ["", "", "（2025版）", "（2024版）", "（A款）", "（B款）", "（2025版B款）", "（扩展版）"]
+_EN_EDITS = ["", "", " (amended)", " extension", " clause", " (2025)"]
+
+
+def _seed_library_rows() -> List[Tuple[str, str, str]]:
+    from openpyxl import load_workbook
+    wb = load_workbook(SEED_LIBRARY, read_only=True)
+    rows = []
+    for name, reg, content, *_ in wb.active.iter_rows(min_row=2, values_only=True):
+        if name and str(name).strip():
+            rows.append((str(name).strip(), str(reg or ""), str(content or "")))
+    wb.close()
+    return rows
+
+
+def _sentences(text: str) -> List[str]:
+    return [s + "。" for s in text.split("。") if s.strip()]
+
+
+def synthesize_library_rows(rows: int, seed: int = 0) -> List[Tuple[str, str, str]]:
+    """生成 rows 条 (名称, 注册号, 内容)；不超过种子条数时为种子的随机子集"""
+    rng = random.Random(seed)
+    seeds = _seed_library_rows()
+    if rows <= len(seeds):
+        return rng.sample(seeds, rows)
+
+    prefixes, bodies = [], []
+    for name, _, _ in seeds:
+        base = _VERSION.sub("", name)
+        if "附加" in base:
+            prefix, body = base.split("附加", 1)
+            prefixes.append(prefix)
+            bodies.append(body)
+        else:
+            bodies.append(base)
+    prefixes = prefixes or [""]
+    sentences = [_sentences(content) for _, _, content in seeds]
+    sentences = [s for s in sentences if s] or [["兹经双方同意。"]]
+
+    result, seen = list(seeds), {name for name, _, _ in seeds}
+    while len(result) < rows:
+        prefix = rng.choice(prefixes)
+        name = (prefix + "附加" if prefix else "") + rng.choice(bodies) + rng.choice(_SUFFIXES)
+        if name in seen:
+            name = f"{name[:-1]}{len(result)}）" if name.endswith("）") else f"{name}（{len(result)}）"
+        seen.add(name)
+        parts = rng.choice(sentences)[:rng.randint(1, 4)] + rng.choice(sentences)[:rng.randint(0, 3)]
+        reg = "产品注册号：C%028d" % rng.randrange(10 ** 27)
+        result.append((name, reg, "".join(parts)))
+    rng.shuffle(result)
+    return result
+
+
+def write_library(path: str, rows: List[Tuple[str, str, str]]):
+    """按种子工作簿的版式写出条款库（首行为表头）"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(LIBRARY_HEADER)
+    for row in rows:
+        ws.append(list(row))
+    wb.save(path)
+
+
+def _perturb(title: str, rng: random.Random, english: bool) -> str:
+    """轻微改写标题：删去版本括注或追加后缀，使其只能模糊匹配"""
+    if english:
+        return title.rstrip(";.: ") + rng.choice(_EN_EDITS)
+    base = _VERSION.sub("", title)
+    return base + rng.choice(_SUFFIXES) if base != title else title + rng.choice(_SUFFIXES[2:])
+
+
+def synthesize_clauses(language: str, count: int, seed: int = 0,
+                       perturb_ratio: float = 0.3) -> List[Tuple[str, str]]:
+    """从客户文档种子抽样 count 条 (标题, 内容)，约 perturb_ratio 的标题被改写"""
+    from clause_diff_core import ClauseMatcherLogic
+    rng = random.Random(seed)
+    seeds, _ = ClauseMatcherLogic.parse_docx(SEED_DOCS[language])
+    seeds = [(c.title, c.content) for c in seeds if c.title]
+    picked = [seeds[i % len(seeds)] for i in range(count)]
+    rng.shuffle(picked)
+    return [(_perturb(title, rng, language == "en") if rng.random() < perturb_ratio else title, content)
+            for title, content in picked]
+
+
+def write_docx(path: str, clauses: List[Tuple[str, str]], title_only: bool = False,
+               template: Optional[str] = None):
+    """
+    以 template（默认 client_cn.docx）为外壳写出 docx：替换正文段落，保留分节符与其余部件。
+    每条款为标题段 + 内容段（按行拆分），条款之间插入空段落。
+    """
+    template = template or SEED_DOCS["cn"]
+
+    def para(text: str) -> str:
+        if not text:
+            return "<w:p/>"
+        return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+    body = []
+    for title, content in clauses:
+        body.append(para(title))
+        if not title_only:
+            body.extend(para(line) for line in content.split("\n") if line)
+        body.append(para(""))
+
+    with zipfile.ZipFile(template) as zin:
+        xml = zin.read("word/document.xml").decode("utf-8")
+        m = re.search(r"(<w:body>)(.*?)(<w:sectPr\b.*</w:body>)", xml, re.S)
+        xml = xml[:m.start(2)] + "".join(body) + xml[m.end(2):]
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                data = xml.encode("utf-8") if item.filename == "word/document.xml" else zin.read(item)
+                zout.writestr(item, data)
+
+
+def build_corpus(out_dir: str, rows: int, clauses: int, seed: int = 0) -> Dict[str, str]:
+    """
+    生成一套语料，返回路径：library、以及 cn_full / cn_title / en_full / en_title 四份客户文档。
+    同一目录下已存在的文件直接复用。
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {"library": os.path.join(out_dir, f"library_{rows}.xlsx")}
+    if not os.path.exists(paths["library"]):
+        write_library(paths["library"], synthesize_library_rows(rows, seed))
+    for language in SEED_DOCS:
+        items = None
+        for mode in ("full", "title"):
+            key = f"{language}_{mode}"
+            paths[key] = os.path.join(out_dir, f"client_{key}_{clauses}.docx")
+            if os.path.exists(paths[key]):
+                continue
+            items = items or synthesize_clauses(language, clauses, seed)
+            write_docx(paths[key], items, title_only=(mode == "title"))
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="生成合成条款库与客户文档")
+    parser.add_argument("out_dir", help="输出目录")
+    parser.add_argument("--rows", type=int, default=10000, help="条款库条数")
+    parser.add_argument("--clauses", type=int, default=200, help="每份客户文档的条款数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args(argv)
+
+    for key, path in build_corpus(args.out_dir, args.rows, args.clauses, args.seed).items():
+        print(f"{key:<10}{path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+docx 段落解析基准：python-docx 对象模型 vs docx_stream 流式解析
+- 样本：client_en.docx、client_cn.docx，以及把 client_cn.docx 正文复制 N 份得到的大文档
+- 每种解析器在独立子进程中运行，记录耗时与峰值内存增量（ru_maxrss）
+- 两种解析器得到的段落列表必须完全一致，否则以非零状态退出
+
+用法:
+    python -m benchmarks.docx_parse [--copies 200] [--repeat 3]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+from benchmarks.common import ROOT, report, sample_path
+
+SAMPLES = ["client_en.docx", "client_cn.docx"]
+PARSERS = ["python-docx", "stream"]
+
+
+def _peak_rss_kb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def read_paragraphs(parser: str, path: str) -> List[str]:
+    if parser == "python-docx":
+        from docx import Document
+        return [p.text for p in Document(path).paragraphs]
+    from docx_stream import iter_docx_paragraphs
+    return list(iter_docx_paragraphs(path))
+
+
+def run_child(parser: str, path: str):
+    """子进程入口：解析一次并输出 JSON 结果"""
+    if parser == "python-docx":
+        import docx  # noqa: F401  导入耗时不计入解析
+    else:
+        import docx_stream  # noqa: F401
+    base_rss = _peak_rss_kb()
+    start = time.perf_counter()
+    paragraphs = read_paragraphs(parser, path)
+    elapsed = time.perf_counter() - start
+    digest = hashlib.sha1("\x00".join(paragraphs).encode("utf-8")).hexdigest()
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_mb": max(0.0, _peak_rss_kb() - base_rss) / 1024,
+        "paragraphs": len(paragraphs),
+        "digest": digest,
+    }))
+
+
+def measure(parser: str, path: str) -> Dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.docx_parse", "--child", parser, path],
+        cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{parser} 解析 {path} 失败:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def build_large_docx(source: str, target: str, copies: int):
+    """把 source 正文（不含分节符）重复 copies 次写成新的 docx"""
+    with zipfile.ZipFile(source) as zin:
+        xml = zin.read("word/document.xml").decode("utf-8")
+        m = re.search(r"(<w:body>)(.*?)(<w:sectPr\b.*</w:body>)", xml, re.S)
+        body = m.group(2)
+        xml = xml[:m.start(2)] + body * copies + xml[m.end(2):]
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                data = xml.encode("utf-8") if item.filename == "word/document.xml" else zin.read(item)
+                zout.writestr(item, data)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="docx 段落解析基准")
+    parser.add_argument("--copies", type=int, default=200, help="大文档中正文的复制份数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个样本每种解析器的运行次数（取最快一次）")
+    parser.add_argument("--child", nargs=2, metavar=("PARSER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(*args.child)
+        return 0
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        large = os.path.join(tmp, f"client_cn_x{args.copies}.docx")
+        build_large_docx(sample_path("client_cn.docx"), large, args.copies)
+        paths = [sample_path(name) for name in SAMPLES] + [large]
+
+        print(f"{'样本':<28}{'解析器':<14}{'段落数':>8}{'耗时(s)':>10}{'峰值内存(MB)':>14}")
+        for path in paths:
+            results = {}
+            for name in PARSERS:
+                runs = [measure(name, path) for _ in range(max(1, args.repeat))]
+                best = min(runs, key=lambda r: r["seconds"])
+                results[name] = best
+                print(f"{os.path.basename(path):<28}{name:<14}{best['paragraphs']:>8}"
+                      f"{best['seconds']:>10.3f}{best['peak_mb']:>14.1f}")
+            base, stream = results["python-docx"], results["stream"]
+            print(f"{'':<28}{'加速比':<14}{base['seconds'] / max(stream['seconds'], 1e-9):>28.1f}x")
+            if base["digest"] != stream["digest"]:
+                failures.append(f"{os.path.basename(path)}: 段落列表与 python-docx 不一致")
+
+    return report(failures, "流式解析结果与 python-docx 完全一致")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+匹配规模基准：条款库条数 × 文档模式（完整内容 / 纯标题）× 语言（中文 / 英文）
+- 语料由 benchmarks.corpus 以仓库样本为种子生成，默认条款库 100 ~ 100000 条
+- 每个组合在独立子进程中运行一次完整的 ClauseMatchPipeline，开启性能统计，
+  记录各阶段耗时、计数与单条匹配耗时分布（均值 / p50 / p95 / 最大）
+- 为使结果可比：关闭匹配结果缓存与条款库缓存，不调用在线翻译（英文只走内置术语表）
+- 结果写入 JSON（默认 benchmarks/results/scaling.json），作为优化前后对比的基线
+
+用法:
+    python -m benchmarks.scaling [--sizes 100,1000,10000,100000] [--clauses 200]
+                                 [--modes full,title] [--languages cn,en]
+                                 [--processes N] [--batch-tfidf] [--content-similarity minhash]
+                                 [--out 结果.json] [--corpus 目录]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List
+
+from benchmarks.common import ROOT, offline
+
+DEFAULT_OUT = os.path.join(ROOT, "benchmarks", "results", "scaling.json")
+
+
+def run_child(doc: str, library: str, processes: int, batch_tfidf: bool, content_similarity: str):
+    """子进程入口：跑一次完整流程，输出 PerfRecorder 统计"""
+    from clause_diff_core import ClauseConfig, ClauseMatchPipeline
+    ClauseConfig.CONTENT_SIMILARITY = content_similarity
+    offline()
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = ClauseMatchPipeline(doc, library, os.path.join(tmp, "report.xlsx"),
+                                       batch_tfidf=batch_tfidf, processes=processes, perf_stats=True)
+        stats = pipeline.run()
+    perf = pipeline.perf.as_dict()
+    perf["match_levels"] = stats
+    print(json.dumps(perf, ensure_ascii=False))
+
+
+def _clause_summary(clauses: List[Dict]) -> Dict:
+    ms = sorted(c["seconds"] * 1000 for c in clauses)
+    if not ms:
+        return {}
+    return {
+        "mean": round(statistics.fmean(ms), 3),
+        "p50": round(ms[len(ms) // 2], 3),
+        "p95": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "max": round(ms[-1], 3),
+    }
+
+
+def measure(doc: str, library: str, processes: int, batch_tfidf: bool, content_similarity: str) -> Dict:
+    cmd = [sys.executable, "-m", "benchmarks.scaling", "--child", doc, library,
+           "--processes", str(processes), "--content-similarity", content_similarity]
+    cmd += ["--batch-tfidf"] if batch_tfidf else []
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"比对 {os.path.basename(doc)} 失败:\n{proc.stderr}")
+    perf = json.loads(proc.stdout.strip().splitlines()[-1])
+    perf["process_seconds"] = round(time.perf_counter() - start, 3)
+    perf["per_clause_ms"] = _clause_summary(perf.pop("clauses"))
+    return perf
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="条款匹配规模基准")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="条款库条数，逗号分隔")
+    parser.add_argument("--clauses", type=int, default=200, help="每份客户文档的条款数")
+    parser.add_argument("--modes", default="full,title", help="full（完整内容）/ title（纯标题）")
+    parser.add_argument("--languages", default="cn,en", help="cn / en")
+    parser.add_argument("--processes", type=int, default=0, help="并行匹配进程数（0 为串行）")
+    parser.add_argument("--batch-tfidf", action="store_true", help="使用 TF-IDF 批量召回")
+    parser.add_argument("--content-similarity", choices=("difflib", "minhash", "auto"), default="difflib",
+                        help="正文相似度算法")
+    parser.add_argument("--seed", type=int, default=0, help="语料随机种子")
+    parser.add_argument("--corpus", default=None, help="语料目录（默认临时目录；指定后可复用）")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="结果 JSON 路径")
+    parser.add_argument("--child", nargs=2, metavar=("DOC", "LIBRARY"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(*args.child, args.processes, args.batch_tfidf, args.content_similarity)
+        return 0
+
+    from benchmarks.corpus import build_corpus
+    sizes = [int(s) for s in _csv(args.sizes)]
+    modes, languages = _csv(args.modes), _csv(args.languages)
+    cases = []
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus or tmp
+        print(f"{'条款库':>8}{'模式':>7}{'语言':>5}{'条款数':>7}{'总耗时(s)':>11}"
+              f"{'加载库(s)':>11}{'匹配(s)':>9}{'单条p95(ms)':>13}")
+        for rows in sizes:
+            paths = build_corpus(corpus_dir, rows, args.clauses, args.seed)
+            for mode in modes:
+                for language in languages:
+                    perf = measure(paths[f"{language}_{mode}"], paths["library"],
+                                   args.processes, args.batch_tfidf, args.content_similarity)
+                    case = {"library_rows": rows, "mode": mode, "language": language, **perf}
+                    cases.append(case)
+                    stages = perf["stages"]
+                    print(f"{rows:>10}{mode:>8}{language:>6}{perf['counters'].get('条款数', 0):>9}"
+                          f"{perf['total_seconds']:>13.2f}{stages.get('加载条款库', 0):>13.2f}"
+                          f"{stages.get('条款匹配', 0):>11.2f}{perf['per_clause_ms'].get('p95', 0):>15.1f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": {"clauses": args.clauses, "processes": args.processes,
+                       "batch_tfidf": args.batch_tfidf, "content_similarity": args.content_similarity,
+                       "seed": args.seed},
+            "cases": cases,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+冷启动基准：窗口显示前的耗时与逐模块导入耗时
+- 每个工具在全新的子进程中启动，测量从创建进程到窗口 show() 完成的墙钟时间
+- 另用 `python -X importtime` 记录逐模块导入耗时，列出最慢的模块
+- 重型依赖（pandas / python-docx / openpyxl 等）若在启动阶段被导入视为回退
+- 任一工具超出预算或提前导入重型依赖时以非零状态退出
+
+用法:
+    python -m benchmarks.startup [--repeat 3] [--budget 秒] [--top 15]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import ROOT, report
+
+# (模块, 主窗口类, 冷启动预算秒数)；主窗口类为 None 时只测导入
+TARGETS: List[Tuple[str, Optional[str], float]] = [
+    ("clause_diff_gui_ultimate_v14", "ClauseDiffGUI", 2.0),
+    ("word_extractor_gui_v7_1", "WordExtractorGUI", 2.0),
+    ("clause_diff_cli", None, 1.0),
+]
+
+# 这些模块只应在工作线程首次用到时导入
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "openpyxl", "docx", "deep_translator")
+
+_LAUNCH_SNIPPET = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import {module} as m
+t_import = time.time()
+if {window!r}:
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication([])
+    w = getattr(m, {window!r})()
+    w.show()
+    app.processEvents()
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"imported": t_import, "shown": time.time(), "heavy": heavy}}))
+"""
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def measure_cold_start(module: str, window: Optional[str]) -> Dict:
+    """在新进程中启动一次，返回导入完成 / 窗口显示的时间（相对进程创建）及提前导入的重型模块"""
+    code = _LAUNCH_SNIPPET.format(root=ROOT, module=module, window=window, heavy=HEAVY_MODULES)
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=_child_env(),
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} 启动失败:\n{proc.stderr}")
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "import": report["imported"] - start,
+        "shown": report["shown"] - start,
+        "heavy": report["heavy"],
+    }
+
+
+def measure_import_times(module: str) -> List[Tuple[int, int, str]]:
+    """`python -X importtime` 的逐模块耗时，返回 [(自身微秒, 累计微秒, 模块名)]"""
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); import {module}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          env=_child_env(), capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GUI 工具冷启动基准")
+    parser.add_argument("--repeat", type=int, default=3, help="每个工具的启动次数（取中位数）")
+    parser.add_argument("--budget", type=float, default=None, help="统一覆盖各工具的预算（秒）")
+    parser.add_argument("--top", type=int, default=15, help="列出导入最慢的前 N 个模块")
+    args = parser.parse_args(argv)
+    
+    failures = []
+    for module, window, budget in TARGETS:
+        budget = args.budget if args.budget is not None else budget
+        runs = [measure_cold_start(module, window) for _ in range(max(1, args.repeat))]
+        shown = [r["shown"] for r in runs]
+        median = statistics.median(shown)
+        heavy = sorted({name for r in runs for name in r["heavy"]})
+        
+        print(f"== {module} ==")
+        print(f"   导入完成 {statistics.median(r['import'] for r in runs):.3f}s, "
+              f"{'窗口显示' if window else '就绪'} 中位数 {median:.3f}s "
+              f"(首次 {shown[0]:.3f}s, 预算 {budget:.1f}s)")
+        
+        rows = measure_import_times(module)
+        print(f"   导入最慢的 {args.top} 个模块（累计 / 自身, ms）:")
+        for self_us, cumulative_us, name in sorted(rows, key=lambda r: -r[1])[:args.top]:
+            print(f"   {cumulative_us / 1000:9.1f} {self_us / 1000:9.1f}  {name}")
+        
+        if median > budget:
+            failures.append(f"{module}: 冷启动 {median:.3f}s 超出预算 {budget:.1f}s")
+        if heavy:
+            failures.append(f"{module}: 启动阶段导入了重型依赖 {', '.join(heavy)}")
+    
+    return report(failures, "全部工具在预算内完成冷启动")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
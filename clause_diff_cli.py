@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+智能条款比对工具 v14.0 命令行版
+- 不导入 PyQt5，无需显示器，适合批处理脚本与无界面的 Linux 服务器
+- 流程与图形界面一致：parse_docx -> 加载条款库 -> match_clause -> 生成报告
+- 进度以 JSON 行输出到标准输出，结束时输出统计摘要
+- 客户文档为文件夹时批量比对其中全部 .docx：条款库只加载一次，
+  每份文档的报告写在汇总工作簿同目录，输出路径为汇总工作簿
+- --perf 在报告中追加“性能统计”工作表（各阶段耗时、计数、单条匹配耗时），
+  --perf-json 另写一份 JSON
+
+用法:
+    python clause_diff_cli.py 客户文档.docx 条款库.xlsx 条款比对报告.xlsx [--batch-tfidf] [--processes N]
+                              [--content-similarity minhash] [--perf] [--perf-json perf.json]
+    python clause_diff_cli.py 客户文档文件夹 条款库.xlsx 批量比对汇总.xlsx [--processes -1]
+"""
+
+import sys
+import json
+import time
+import argparse
+import traceback
+import os
+import multiprocessing
+
+from clause_diff_core import ClauseConfig, ClauseMatchPipeline, BatchMatchPipeline
+
+
+def emit(event: str, **payload):
+    """输出一行 JSON 事件"""
+    print(json.dumps({"event": event, **payload}, ensure_ascii=False), flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="智能条款比对（命令行版）")
+    parser.add_argument("doc", help="客户条款 Word 文档 (.docx)，或包含多份文档的文件夹")
+    parser.add_argument("library", help="标准条款库 Excel (.xlsx)")
+    parser.add_argument("output", help="比对报告保存路径 (.xlsx)；批量模式下为汇总工作簿路径")
+    parser.add_argument("--batch-tfidf", action="store_true", help="整篇文档使用 TF-IDF 批量召回候选")
+    parser.add_argument("--processes", type=int, default=None, help="并行匹配进程数（-1 为 CPU 核数）")
+    parser.add_argument("--content-similarity", choices=("difflib", "minhash", "auto"), default=None,
+                        help="正文相似度算法（默认取 ClauseConfig.CONTENT_SIMILARITY）")
+    parser.add_argument("--dedup-index", action="store_true",
+                        help="使用条款库旁的去重索引，模糊候选只取各簇代表条目（默认取 ClauseConfig.DEDUP_INDEX）")
+    parser.add_argument("--perf", action="store_true", help="记录各阶段耗时，报告中追加“性能统计”工作表")
+    parser.add_argument("--perf-json", default=None, metavar="PATH", help="性能统计另存为 JSON（隐含 --perf）")
+    args = parser.parse_args(argv)
+    
+    if args.content_similarity:
+        ClauseConfig.CONTENT_SIMILARITY = args.content_similarity
+    if args.dedup_index:
+        ClauseConfig.DEDUP_INDEX = True
+    
+    start = time.perf_counter()
+    options = dict(
+        batch_tfidf=True if args.batch_tfidf else None,
+        processes=args.processes,
+        perf_stats=True if args.perf else None,
+        perf_json=args.perf_json,
+        log=lambda msg, level: emit("log", level=level, message=msg),
+        progress=lambda done, total: emit("progress", done=done, total=total),
+    )
+    extra = {}
+    try:
+        if os.path.isdir(args.doc):
+            docs = BatchMatchPipeline.collect_documents(args.doc)
+            if not docs:
+                raise FileNotFoundError(f"文件夹中没有 .docx 文档: {args.doc}")
+            pipeline = BatchMatchPipeline(docs, args.library, args.output, **options)
+            extra["documents"] = len(docs)
+        else:
+            pipeline = ClauseMatchPipeline(args.doc, args.library, args.output, **options)
+        stats = pipeline.run()
+    except Exception as e:
+        emit("error", message=str(e), traceback=traceback.format_exc())
+        return 1
+    
+    emit("summary", output=args.output, elapsed=round(time.perf_counter() - start, 3),
+         total=sum(stats.values()), **extra, **stats)
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
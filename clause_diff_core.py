@@ -0,0 +1,2840 @@
+# -*- coding: utf-8 -*-
+"""
+智能条款比对核心 v14.0 (Client Mapping Enhanced Edition)
+- 配置层、匹配逻辑与比对流程，不依赖 PyQt5
+- 供 clause_diff_gui_ultimate_v14.py（图形界面）与 clause_diff_cli.py（命令行）共用
+
+Author: Dachi Yijin
+Date: 2025-12-18
+"""
+
+import os
+import sys
+import re
+import time
+import sqlite3
+import threading
+import difflib
+import bisect
+import heapq
+import pickle
+import random
+import json
+import hashlib
+import contextlib
+import importlib.util
+from functools import lru_cache
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet, Callable, Sequence
+from dataclasses import dataclass, field
+from enum import Enum
+
+from docx_stream import iter_docx_paragraphs
+
+# pandas / openpyxl / deep_translator / numpy / scipy 均在首次使用处导入，
+# 图形界面无需等待它们加载即可显示窗口；这里只探测可选依赖是否已安装
+HAS_TRANSLATOR = importlib.util.find_spec("deep_translator") is not None
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_SCIPY = HAS_NUMPY and importlib.util.find_spec("scipy") is not None
+
+
+# ==========================================
+# 配置层：所有映射字典集中管理
+# ==========================================
+class ClauseConfig:
+    """条款配置 - 集中管理所有映射字典"""
+    
+    # ========================================
+    # 🎯 客户中英文条款精确映射（基于客户实际文档）
+    # ========================================
+    CLIENT_EN_CN_MAP: Dict[str, str] = {
+        # ===== 用户重点关注的条款 =====
+        "interpretation & headings": "通译和标题条款",
+        "interpretation and headings": "通译和标题条款",
+        "reinstatement (value)": "重置价值条款",
+        "reinstatement value": "重置价值条款",
+        "reinstatement value clause": "重置价值条款",
+        "replacement value": "重置价值条款",
+        "replacement value clause": "重置价值条款",
+        "time adjustment (72 hours)": "72小时条款",
+        "time adjustment": "72小时条款",
+        "72 hours clause": "72小时条款",
+        "civil authorities clause": "公共当局扩展条款",
+        "civil authorities": "公共当局扩展条款",
+        "public authorities clause": "公共当局扩展条款",
+        "public authorities": "公共当局扩展条款",
+        "errors and omissions clause": "错误和遗漏条款",
+        "errors and omissions": "错误和遗漏条款",
+        "loss notification clause": "损失通知条款",
+        "loss notification": "损失通知条款",
+        "no control": "不受控制条款",
+        "no control clause": "不受控制条款",
+        "no contorl": "不受控制条款",  # 客户文档拼写
+        
+        # ===== 财产一切险条款 =====
+        "60 days' notice of cancellation by insurer": "60天通知注销保单条款",
+        "60 days notice of cancellation": "60天通知注销保单条款",
+        "notice of cancellation": "注销保单条款",
+        "expediting costs": "加快费用条款",
+        "all other contents": "其它物品条款",
+        "alterations, additions and repairs": "变更和维修条款",
+        "alterations additions and repairs": "变更和维修条款",
+        "escalation": "自动升值扩展条款",
+        "automatic cover for new asset": "自动扩展承保新增资产、新增公司和新增地址条款",
+        "automatic cover for new asset, or newly set up companies and locations": "自动扩展承保新增资产、新增公司和新增地址条款",
+        "unnamed location clause": "未列明地址条款",
+        "unnamed location": "未列明地址条款",
+        "automatic capital additions": "增加资产条款",
+        "capital additions": "增加资产条款",
+        "stock declaration & adjustment": "仓储财产申报条款",
+        "stock declaration and adjustment": "仓储财产申报条款",
+        "stock declaration": "仓储财产申报条款",
+        "automatic reinstatement of sum insured": "自动恢复保险金额条款",
+        "brand or trademark": "品牌和商标标识条款",
+        "brand and trademark": "品牌和商标标识条款",
+        "professional fees and claim preparation costs": "专业费用及索赔准备费用条款",
+        "professional fees": "专业费用及索赔准备费用条款",
+        "claims preparation costs": "专业费用及索赔准备费用条款",
+        "tax clause": "税金约定条款",
+        "earthquake and tsunami clause": "地震扩展条款",
+        "earthquake and tsunami": "地震扩展条款",
+        "earthquake extension": "地震扩展条款",
+        "theft and robbery": "盗窃、抢劫扩展条款",
+        "full theft, burglary and robbery cover": "承保全部盗窃条款",
+        "full theft": "承保全部盗窃条款",
+        "description of property insured": "被保险财产条款",
+        "public utility clause": "公用设施故障条款",
+        "public utilities": "公用设施故障条款",
+        "multiple insureds clause": "共同被保险人条款",
+        "multiple insureds": "共同被保险人条款",
+        "frozen and refrigerated property clause": "冷冻、冷藏品条款",
+        "frozen and refrigerated": "冷冻、冷藏品条款",
+        "removal of debris": "清理残骸费用扩展条款",
+        "debris removal": "清理残骸费用扩展条款",
+        "strike, riot, civil commotion": "罢工、暴动或民众骚乱条款",
+        "strike riot civil commotion": "罢工、暴动或民众骚乱条款",
+        "srcc": "罢工、暴动或民众骚乱条款",
+        "temporary removal": "临时移动扩展条款",
+        "vehicle load": "车辆装载物扩展条款",
+        "80% co-insurance": "80％共保条款",
+        "co-insurance": "共保条款",
+        "outside ancilliary devices of buildings": "建筑物外部附属设施扩展条款",
+        "outside ancillary devices": "建筑物外部附属设施扩展条款",
+        "contract price": "合同价格扩展条款",
+        "preference of original supplier": "优先使用原供应商条款",
+        "original supplier": "优先使用原供应商条款",
+        "nominated loss adjuster clause": "指定公估人条款",
+        "nominated loss adjuster": "指定公估人条款",
+        "loss adjuster clause": "指定公估人条款",
+        "portable devices extension clause": "便携式设备扩展条款",
+        "portable devices extension": "便携式设备扩展条款",
+        "portable devices": "便携式设备扩展条款",
+        "breakage of glass extension clause": "玻璃破碎条款",
+        "breakage of glass": "玻璃破碎条款",
+        "glass breakage": "玻璃破碎条款",
+        "property under care, custody and control clause": "被保险人照料、保管或控制的第三方财产条款",
+        "care custody and control": "被保险人照料、保管或控制的第三方财产条款",
+        "mortgage clause": "抵押权条款",
+        "water tank and water pipe burst extension clause": "水箱、水管爆裂扩展条款",
+        "water tank and water pipe burst": "水箱、水管爆裂扩展条款",
+        "nature and gradual loss exclusion": "自然及渐变损失澄清条款",
+        "gradual loss": "自然及渐变损失澄清条款",
+        "insured amount breakdown clause": "保险金额分项条款",
+        
+        # ===== 营业中断险条款 =====
+        "scope of cover clause": "保单责任保障",
+        "scope of cover": "保单责任保障",
+        "maintenance cost clause": "全部维持费用投保条款",
+        "100% payroll clause": "100％工资投保条款",
+        "100% payroll": "100％工资投保条款",
+        "earthquake extension clause": "地震、海啸营业中断扩展条款",
+        "loss of book debts clause": "遗失欠款帐册条款",
+        "loss of book debts": "遗失欠款帐册条款",
+        "accumulated stock clause": "累积库存条款",
+        "accumulated stocks": "累积库存条款",
+        "output option clause": "产出替代条款",
+        "output option": "产出替代条款",
+        "prevention of access clause": "通道堵塞条款",
+        "prevention of access": "通道堵塞条款",
+        "denial of access": "通道堵塞条款",
+        "extra expenses": "额外费用条款",
+        "failure of public utilities clause": "公共事业设备失灵扩展条款",
+        "failure of public utilities": "公共事业设备失灵扩展条款",
+        "interdependency extension clause": "关联扩展条款",
+        "interdependency extension": "关联扩展条款",
+        "interdependency": "关联扩展条款",
+        "suppliers, customers and contractors' premises clause": "顾客/供应商/承包商条款",
+        "suppliers customers and contractors": "顾客/供应商/承包商条款",
+        "murder, suicide or disease or defective sanitation clause": "谋杀、自杀、疾病或卫生设施缺陷条款",
+        "murder suicide or disease": "谋杀、自杀、疾病或卫生设施缺陷条款",
+        "new business clause": "新营业条款",
+        "new business": "新营业条款",
+        "premium adjustment clause": "保费调整条款",
+        "premium adjustment": "保费调整条款",
+        "waiver of average clause": "放弃比例分摊条款",
+        "waiver of average": "放弃比例分摊条款",
+        "leased building/premises extension": "租赁房屋/场所扩展条款",
+        "leased building premises extension": "租赁房屋/场所扩展条款",
+        "leased premises": "租赁房屋/场所扩展条款",
+        "continuous loss clause": "持续损失条款",
+        "continuous loss": "持续损失条款",
+        "waive deductible clause": "物质损失放弃免赔条款",
+        "waive deductible": "物质损失放弃免赔条款",
+        
+        # ===== 机器损坏险条款 =====
+        "boiler and pressure vessel explosion clause": "锅炉及压力容器爆炸条款",
+        "boiler and pressure vessel": "锅炉及压力容器爆炸条款",
+        "boiler explosion": "锅炉及压力容器爆炸条款",
+        "manufacturer or supplier's warranties": "制造商/供应商担保条款",
+        "manufacturer warranties": "制造商/供应商担保条款",
+        "acquisitions": "获得新设备条款",
+        "shutdown and restart cost clause": "停机及重启损失条款",
+        "shutdown and restart": "停机及重启损失条款",
+        "operating media, vulnerable or consumables property extension": "媒介物、易损、易耗品扩展条款",
+        "operating media": "媒介物、易损、易耗品扩展条款",
+        "intellectual property protection": "知识产权保护条款",
+    }
+    
+    # ========================================
+    # 🔄 语义别名映射（解决同一概念不同表述）
+    # ========================================
+    SEMANTIC_ALIAS_MAP: Dict[str, str] = {
+        # 污染相关
+        "污染保险": "意外污染责任",
+        "污染责任": "意外污染责任", 
+        "意外污染": "意外污染责任",
+        
+        # 露天财产
+        "保险标的置存处所保险": "露天及简易建筑内存放财产",
+        "置存处所": "露天及简易建筑内存放财产",
+        "露天财产": "露天及简易建筑内存放财产",
+        "简易建筑": "露天及简易建筑内存放财产",
+        
+        # 损害防止/施救
+        "损害防止保险条款": "阻止损失",
+        "损害防止": "阻止损失",
+        "施救费用": "阻止损失",
+        "sue and labor": "阻止损失",
+        
+        # 崩塌沉降
+        "崩塌与沉降保险条款": "地面突然下陷下沉",
+        "崩塌与沉降": "地面突然下陷下沉",
+        "崩塌沉降": "地面突然下陷下沉",
+        "地面下陷": "地面突然下陷下沉",
+        "地面下沉": "地面突然下陷下沉",
+        "地陷下沉": "地面突然下陷下沉",
+        "subsidence": "地面突然下陷下沉",
+        
+        # 重置价值变体
+        "重置(价值)": "重置价值",
+        "重建价值": "重置价值",
+        "replacement": "重置价值",
+        
+        # 时间调整变体
+        "时间调整": "72小时",
+        "72hours": "72小时",
+        "seventy two hours": "72小时",
+        
+        # 公共当局变体
+        "公共当局": "公共当局扩展",
+        "civil authority": "公共当局扩展",
+        "public authority": "公共当局扩展",
+        
+        # 其他映射
+        "水渍险": "水渍",
+        "水损": "水渍",
+        "暴风雨": "暴风暴雨洪水",
+        "洪水": "暴风暴雨洪水",
+    }
+    
+    # ========================================
+    # 🔑 关键词提取映射
+    # ========================================
+    KEYWORD_EXTRACT_MAP: Dict[str, List[str]] = {
+        "污染": ["污染", "意外污染", "pollution"],
+        "露天": ["露天", "简易", "置存处所", "outdoor"],
+        "阻止": ["阻止", "损害防止", "施救", "sue labor"],
+        "下陷": ["下陷", "下沉", "崩塌", "沉降", "subsidence"],
+        "地震": ["地震", "震动", "earthquake"],
+        "海啸": ["海啸", "tsunami"],
+        "盗窃": ["盗窃", "盗抢", "抢劫", "burglary", "theft", "robbery"],
+        "火灾": ["火灾", "火险", "fire"],
+        "洪水": ["洪水", "水灾", "flood"],
+        "重置": ["重置", "重建", "reinstatement", "replacement"],
+        "时间调整": ["时间调整", "72小时", "72hours", "seventy-two", "time adjustment"],
+        "公共当局": ["公共当局", "civil authority", "public authority"],
+        "通知": ["通知", "notification", "notice"],
+        "错误遗漏": ["错误", "遗漏", "errors", "omissions"],
+        "控制": ["控制", "control"],
+        "通道堵塞": ["通道堵塞", "通道", "堵塞", "prevention of access", "denial of access"],
+        "关联": ["关联", "interdependency"],
+        "累积库存": ["累积库存", "累积存货", "accumulated stock"],
+    }
+    
+    # ========================================
+    # 📌 精确条款名映射（客户条款 -> 条款库名称）
+    # ========================================
+    EXACT_CLAUSE_MAP: Dict[str, str] = {
+        "72小时条款": "时间调整（72小时）",
+        "时间调整条款": "时间调整",
+        "通道堵塞条款": "通道堵塞",
+        "关联扩展条款": "关联扩展",
+        "累积库存条款": "累积库存",
+    }
+    
+    # ========================================
+    # ⚠️ 惩罚关键词
+    # ========================================
+    PENALTY_KEYWORDS: List[str] = ["打孔盗气"]
+    
+    # ========================================
+    # 🏷️ 噪音词（清理时移除）
+    # ========================================
+    NOISE_WORDS: List[str] = [
+        "企业财产保险", "附加", "扩展", "条款", "险", 
+        "（A款）", "（B款）", "(A款)", "(B款)",
+        "2025版", "2024版", "2023版", "2022版", "版",
+        "clause", "extension", "cover", "insurance",
+    ]
+    NORMALIZE_CACHE_SIZE: int = 65536         # normalize_text / clean_title 结果的 LRU 条数
+    NORMALIZE_CONTENT_CACHE_SIZE: int = 1024  # clean_content 结果的 LRU 条数（正文较长，单独限额）
+    
+    # ========================================
+    # 📄 文档解析
+    # ========================================
+    DOCX_INCLUDE_TABLES: bool = False    # True 时表格单元格中的段落也参与条款切分
+    
+    # ========================================
+    # 🔍 模糊匹配候选召回（字符 n-gram 倒排索引）
+    # ========================================
+    TITLE_NGRAM_SIZES: Tuple[int, ...] = (1, 2, 3)   # 标题较短，保留单字以贴近 SequenceMatcher
+    CONTENT_NGRAM_SIZES: Tuple[int, ...] = (2, 3)
+    FUZZY_CANDIDATE_LIMIT: int = 50      # 每条客户条款进入 SequenceMatcher 的候选数
+    NGRAM_MAX_DF_RATIO: float = 0.5      # 内容 n-gram 出现在超过该比例库条目中时忽略
+    FUZZY_BRUTE_FORCE: bool = False      # True 时跳过召回、逐条全量比对（用于校验结果）
+    FUZZY_PRUNING: bool = True           # 用长度/quick_ratio 上界跳过不可能胜出的候选（结果不变）
+    MATCH_ALTERNATIVES: int = 3          # 每条客户条款额外保留的备选条款数，报告中输出为“备选1..k”列（0 为不输出）
+    BATCH_TFIDF: bool = False            # True 时整篇文档用 TF-IDF 稀疏矩阵一次性召回候选
+    BATCH_CHUNK_BYTES: int = 64 << 20    # 得分矩阵按行分块的内存预算：每块行数 = 预算 / (库条数 × 每格字节数)
+    MATCH_PROCESSES: int = 0             # 并行匹配进程数：0/1 为单进程，-1 为 CPU 核数
+    MATCH_PARALLEL_MIN_CLAUSES: int = 50 # 条款数低于该值时不启动进程池（启动开销大于收益）
+    
+    # ========================================
+    # 📏 内容相似度（长条款正文）
+    # ========================================
+    # "difflib": SequenceMatcher.ratio（原算法，最坏情况为平方复杂度）
+    # "minhash": 字符 shingle 的 MinHash 签名估计 Jaccard，条款库签名建索引时预先计算，并用 LSH 分桶补充候选
+    # "auto":    客户条款与库条款正文都不短于 MINHASH_MIN_CHARS 时用 MinHash，否则仍用 difflib
+    CONTENT_SIMILARITY: str = "difflib"
+    MINHASH_MIN_CHARS: int = 1000        # "auto" 模式下启用 MinHash 的正文长度
+    MINHASH_SHINGLE: int = 3             # shingle 字符数
+    MINHASH_PERMUTATIONS: int = 64       # 签名长度（哈希函数个数），估计误差约 1/sqrt(n)
+    MINHASH_BANDS: int = 16              # LSH 分桶数，须整除 MINHASH_PERMUTATIONS；每桶行数越少召回越宽
+    
+    # ========================================
+    # 🧩 条款库近似重复（clause_library_dedup.py）
+    # ========================================
+    DEDUP_CONTENT_THRESHOLD: float = 0.9 # 清理后标题相同且正文 MinHash 相似度不低于该值视为同一簇
+    DEDUP_INDEX: bool = False            # 启用后，条款库旁有去重索引（--write-index 生成）时模糊候选只取各簇代表条目
+    DEDUP_INDEX_SUFFIX: str = ".dedup.json"
+    
+    # ========================================
+    # 🌐 翻译
+    # ========================================
+    TRANSLATE_TARGET: str = "zh-CN"
+    TRANSLATE_MAX_WORKERS: int = 8         # 预翻译并发线程数
+    TRANSLATE_RATE_LIMIT: float = 5.0      # 每秒最多发起的翻译请求数
+    TRANSLATE_RETRIES: int = 2             # 单条失败后的重试次数
+    TRANSLATE_RETRY_BACKOFF: float = 0.5   # 重试退避基数（秒），按 2^n 递增
+    TRANSLATE_CALL_TIMEOUT: float = 10.0   # 单次翻译请求的等待上限（秒）
+    TRANSLATE_TIME_BUDGET: float = 120.0   # 整次预翻译的总时长上限（秒）
+    TRANSLATE_BREAKER_THRESHOLD: int = 5   # 连续失败达到该次数后熔断，转为仅术语表模式
+    TRANSLATE_BREAKER_COOLDOWN: float = 60.0  # 熔断后再次尝试在线翻译的间隔（秒）
+    TRANSLATION_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".clause_diff", "translation_cache.db")
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 50000   # 超出后按最近使用时间淘汰
+    
+    # ========================================
+    # 📚 条款库缓存
+    # ========================================
+    LIBRARY_CACHE: bool = True                   # 解析后的条款库与索引缓存到本用户目录，未变化时直接加载
+    # 缓存为 pickle，只放在本用户可写的目录，不放在工作簿所在的（常为共享的）文件夹
+    LIBRARY_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".clause_diff", "library_cache")
+    LIBRARY_CACHE_SUFFIX: str = ".clause_cache"  # 缓存文件名：<工作簿文件名>.<路径哈希><后缀>
+    
+    # ========================================
+    # ♻️ 匹配结果缓存（修订版文档只重算改动过的条款）
+    # ========================================
+    MATCH_CACHE: bool = True
+    MATCH_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".clause_diff", "match_cache.db")
+    MATCH_CACHE_MAX_ENTRIES: int = 200000        # 超出后按最近使用时间淘汰
+    
+    # ========================================
+    # ⏱️ 性能统计
+    # ========================================
+    PERF_STATS: bool = False             # True 时记录各阶段耗时与计数，报告中追加“性能统计”工作表
+    
+    # ========================================
+    # 🔏 配置摘要（条款库缓存 / 匹配结果缓存 / 自动机重建）
+    # ========================================
+    # 只列影响条款库索引或匹配结果的配置项：映射字典、召回与评分参数、内容相似度方式。
+    # 并发、超时、缓存路径与容量、性能统计等不在其中，改动它们不会使缓存失效。
+    # 不列入的还有：FUZZY_PRUNING（剪枝不改变结果）、BATCH_TFIDF（召回方式另计入结果缓存键）、
+    # DOCX_INCLUDE_TABLES / TRANSLATE_TARGET（只影响条款本身，条款内容已在结果缓存键中）
+    FINGERPRINT_KEYS: Tuple[str, ...] = (
+        "CLIENT_EN_CN_MAP", "SEMANTIC_ALIAS_MAP", "KEYWORD_EXTRACT_MAP", "EXACT_CLAUSE_MAP",
+        "PENALTY_KEYWORDS", "NOISE_WORDS",
+        "TITLE_NGRAM_SIZES", "CONTENT_NGRAM_SIZES", "FUZZY_CANDIDATE_LIMIT", "NGRAM_MAX_DF_RATIO",
+        "FUZZY_BRUTE_FORCE", "MATCH_ALTERNATIVES",
+        "CONTENT_SIMILARITY", "MINHASH_MIN_CHARS", "MINHASH_SHINGLE", "MINHASH_PERMUTATIONS", "MINHASH_BANDS",
+    )
+    
+    @classmethod
+    def snapshot(cls) -> Dict[str, object]:
+        """全部配置项（大写属性）的当前值"""
+        return {name: getattr(cls, name) for name in dir(cls) if name.isupper()}
+    
+    @classmethod
+    def fingerprint(cls) -> str:
+        """配置摘要：FINGERPRINT_KEYS 中任一映射表或参数改动都会得到不同的值，用于使缓存失效"""
+        items = [(name, getattr(cls, name)) for name in cls.FINGERPRINT_KEYS]
+        return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+
+# ==========================================
+# 数据结构
+# ==========================================
+class MatchLevel(Enum):
+    """匹配级别"""
+    EXACT = "精确匹配"
+    SEMANTIC = "语义匹配"
+    KEYWORD = "关键词匹配"
+    FUZZY = "模糊匹配"
+    NONE = "无匹配"
+
+@dataclass(slots=True)
+class ClauseItem:
+    """条款项"""
+    title: str
+    content: str
+    original_title: str = ""  # 保留原始标题（英文）
+
+@dataclass(slots=True)
+class MatchCandidate:
+    """备选匹配条款"""
+    name: str
+    reg: str
+    score: float
+    match_level: MatchLevel
+
+@dataclass(slots=True)
+class MatchResult:
+    """匹配结果"""
+    matched_name: str = ""
+    matched_content: str = ""
+    matched_reg: str = ""
+    score: float = 0.0
+    title_score: float = 0.0
+    content_score: float = 0.0
+    match_level: MatchLevel = MatchLevel.NONE
+    diff_analysis: str = ""
+    alternatives: List[MatchCandidate] = field(default_factory=list)  # 按得分排序的次优候选
+    candidates_scored: int = 0  # 逐条比较过的条款库条目数（性能统计用）
+
+
+# ==========================================
+# 翻译记忆库：SQLite 持久化缓存
+# ==========================================
+class TranslationCache:
+    """
+    翻译缓存 - 以 (标准化原文, 翻译服务, 目标语言) 为键，按最近使用淘汰。
+    命中时只在内存中记下使用时间，淘汰也不随每次写入进行：二者由 flush 在一个事务中完成
+    （预翻译阶段结束时调用；阶段内新增条目达 EVICT_BATCH 条时也会提前执行一次）。
+    """
+    EVICT_BATCH = 256   # 两次淘汰之间最多新增的条目数，库内条数至多超出上限这么多
+    
+    def __init__(self, path: str, max_entries: int = 50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[Tuple[str, str, str], float] = {}   # 待写入的命中时间
+        self._inserts = 0   # 上次淘汰以来新增的条目数
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                target TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, provider, target)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations (last_used)")
+    
+    @staticmethod
+    def normalize_key(text: str) -> str:
+        """缓存键：去首尾空白并合并连续空白"""
+        return " ".join(text.split())
+    
+    def get(self, text: str, provider: str, target: str) -> Optional[str]:
+        key = self.normalize_key(text)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translated FROM translations WHERE source=? AND provider=? AND target=?",
+                (key, provider, target)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[(key, provider, target)] = time.time()
+            return row[0]
+    
+    def put(self, text: str, provider: str, target: str, translated: str):
+        key = self.normalize_key(text)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                (key, provider, target, translated, time.time()))
+            self._touched.pop((key, provider, target), None)
+            self._inserts += 1
+            if self._inserts >= self.EVICT_BATCH:
+                self._flush()
+    
+    def flush(self):
+        """写入暂存的命中时间；上次淘汰以来有新增条目时，按最近使用淘汰超出上限的条目"""
+        with self._lock:
+            self._flush()
+    
+    def _flush(self):
+        if not self._touched and not self._inserts:
+            return
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "UPDATE translations SET last_used=? WHERE source=? AND provider=? AND target=?",
+            [(used, *key) for key, used in self._touched.items()])
+        if self._inserts:
+            self._conn.execute("""
+                DELETE FROM translations WHERE rowid IN (
+                    SELECT rowid FROM translations ORDER BY last_used ASC
+                    LIMIT max(0, (SELECT COUNT(*) FROM translations) - ?)
+                )
+            """, (self.max_entries,))
+        self._conn.execute("COMMIT")
+        self._touched.clear()
+        self._inserts = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+
+class MatchResultCache:
+    """
+    匹配结果缓存 - 键为条款（标题 / 原标题 / 内容 / 纯标题模式 / 召回方式）、
+    条款库指纹与 ClauseConfig 摘要的哈希；条款库或配置一变，旧结果自然不再命中。按最近使用淘汰。
+    """
+    FORMAT_VERSION = 4   # 匹配算法或 MatchResult 结构变化时递增
+    
+    def __init__(self, path: str, max_entries: int = 200000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS match_results (
+                key TEXT PRIMARY KEY,
+                result BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_match_last_used ON match_results (last_used)")
+    
+    @classmethod
+    def clause_key(cls, clause: 'ClauseItem', is_title_only: bool, library_fingerprint: str,
+                   config_fingerprint: str, mode: str = "") -> str:
+        payload = repr((cls.FORMAT_VERSION, config_fingerprint, library_fingerprint, mode,
+                        is_title_only, clause.title, clause.original_title, clause.content))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, 'MatchResult']:
+        """批量查询，返回命中的 key -> MatchResult（无法反序列化的条目视为未命中）"""
+        found: Dict[str, MatchResult] = {}
+        unique = list(dict.fromkeys(keys))
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, result FROM match_results WHERE key IN ({marks})", chunk).fetchall()
+                for key, blob in rows:
+                    try:
+                        found[key] = pickle.loads(blob)
+                    except Exception:
+                        continue
+                self._conn.executemany(
+                    "UPDATE match_results SET last_used=? WHERE key=?", [(now, key) for key, _ in rows])
+        return found
+    
+    def put_many(self, items: List[Tuple[str, 'MatchResult']]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO match_results VALUES (?, ?, ?)",
+                [(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), now) for key, result in items])
+            self._conn.execute("""
+                DELETE FROM match_results WHERE rowid IN (
+                    SELECT rowid FROM match_results ORDER BY last_used ASC
+                    LIMIT max(0, (SELECT COUNT(*) FROM match_results) - ?)
+                )
+            """, (self.max_entries,))
+            self._conn.execute("COMMIT")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM match_results").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ==========================================
+# 翻译服务与并发预翻译
+# ==========================================
+class GoogleTranslateBackend:
+    """deep_translator Google 翻译后端；可替换为任何提供 name / translate 的对象"""
+    name = "google"
+    
+    def translate(self, text: str, target: str) -> str:
+        from deep_translator import GoogleTranslator
+        return GoogleTranslator(source='auto', target=target).translate(text)
+
+
+class RateLimiter:
+    """线程安全的请求限速：相邻两次请求至少间隔 1/rate 秒"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class CircuitBreaker:
+    """熔断器：连续失败 threshold 次后断开，cooldown 秒后放行一次试探请求"""
+    
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # 半开：允许下一次请求试探，失败则重新断开
+                self.opened_at = None
+                self.failures = self.threshold - 1
+                return False
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def call_with_deadline(func: Callable, timeout: Optional[float], *args):
+    """
+    在守护线程中执行 func，超过 timeout 秒抛出 TimeoutError。
+    超时的调用不会被强行终止，但不再阻塞调用方，也不会阻止进程退出。
+    """
+    if not timeout or timeout <= 0:
+        return func(*args)
+    box = {}
+    done = threading.Event()
+    
+    def target():
+        try:
+            box['value'] = func(*args)
+        except BaseException as e:
+            box['error'] = e
+        finally:
+            done.set()
+    
+    threading.Thread(target=target, daemon=True).start()
+    if not done.wait(timeout):
+        raise TimeoutError(f"翻译请求超过 {timeout:g} 秒未返回")
+    if 'error' in box:
+        raise box['error']
+    return box['value']
+
+
+class TranslationStage:
+    """
+    预翻译阶段：去重后并发翻译全部待译文本，返回 原文 -> 译文 查找表。
+    先查翻译缓存，未命中的文本经限速与重试后交给翻译后端，成功结果写回缓存；阶段结束时 flush 缓存（命中时间与容量淘汰一次写入）。
+    单次请求有超时上限，整个阶段有总时长预算；连续失败触发熔断后，
+    剩余文本不再请求在线翻译（仅术语表模式），并记录在 failed 中。
+    同一实例可多次 run（批量比对的各份文档）：熔断状态、总时长预算（自首次 run 起算）、failed 与 calls 跨次累计。
+    backend 为 None（未安装 deep_translator）时只查缓存，未命中的文本保留原文、不计入 failed。
+    """
+    
+    def __init__(self, backend, cache: Optional[TranslationCache] = None,
+                 target: str = "zh-CN", max_workers: int = 8, rate_limit: float = 5.0,
+                 retries: int = 2, retry_backoff: float = 0.5,
+                 call_timeout: Optional[float] = None, time_budget: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.backend = backend
+        self.provider = backend.name if backend is not None else GoogleTranslateBackend.name
+        self.cache = cache
+        self.target = target
+        self.max_workers = max(1, max_workers)
+        self.limiter = RateLimiter(rate_limit)
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.call_timeout = call_timeout
+        self.time_budget = time_budget
+        self.breaker = breaker or CircuitBreaker()
+        self.failed: List[str] = []
+        self.calls = 0   # 实际发往翻译后端的请求数（含重试）
+        self._calls_lock = threading.Lock()
+        self._deadline: Optional[float] = None
+    
+    @property
+    def budget_exhausted(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+    
+    @property
+    def glossary_only(self) -> bool:
+        """熔断或超出总时长预算后，本次运行只使用客户字典"""
+        return self.breaker.is_open or self.budget_exhausted
+    
+    def _translate_one(self, text: str) -> Optional[str]:
+        for attempt in range(self.retries + 1):
+            if self.glossary_only:
+                return None
+            self.limiter.acquire()
+            with self._calls_lock:
+                self.calls += 1
+            try:
+                translated = call_with_deadline(
+                    self.backend.translate, self.call_timeout, text, self.target)
+            except Exception:
+                translated = None
+            if translated:
+                self.breaker.record_success()
+                return translated
+            self.breaker.record_failure()
+            if attempt < self.retries and not self.glossary_only:
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        return None
+    
+    def run(self, texts: List[str],
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, str]:
+        table: Dict[str, str] = {}
+        pending = []
+        for text in dict.fromkeys(t for t in texts if t):
+            cached = self.cache.get(text, self.provider, self.target) if self.cache is not None else None
+            if cached is not None:
+                table[text] = cached
+            else:
+                pending.append(text)
+        
+        if pending and self.backend is not None:
+            self._translate_pending(pending, table, progress)
+        if self.cache is not None:
+            self.cache.flush()
+        return table
+    
+    def _translate_pending(self, pending: List[str], table: Dict[str, str],
+                           progress: Optional[Callable[[int, int], None]]):
+        """并发翻译缓存未命中的文本，成功结果写入 table 与缓存"""
+        if self.time_budget and self._deadline is None:
+            self._deadline = time.monotonic() + self.time_budget
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+            for done, (text, translated) in enumerate(
+                    zip(pending, pool.map(self._translate_one, pending)), 1):
+                if translated:
+                    table[text] = translated
+                    if self.cache is not None:
+                        self.cache.put(text, self.provider, self.target, translated)
+                else:
+                    self.failed.append(text)
+                if progress:
+                    progress(done, len(pending))
+
+
+# ==========================================
+# 多模式串匹配：ClauseConfig 字典一次扫描
+# ==========================================
+class AhoCorasick:
+    """Aho-Corasick 自动机 - 单次扫描文本找出所有命中的模式串编号"""
+    
+    def __init__(self, patterns: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        self.always: List[int] = []  # 空模式串在任何文本中都命中
+        
+        for pid, pattern in enumerate(patterns):
+            if not pattern:
+                self.always.append(pid)
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pid)
+        
+        # BFS 构建失败指针（根的子节点指向根），并把后缀状态的输出并入当前状态
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+                queue.append(nxt)
+    
+    def find_ids(self, text: str) -> Set[int]:
+        """返回在 text 中出现过的全部模式串编号"""
+        found = set(self.always)
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+    
+    def first_id(self, texts: Sequence[str]) -> Optional[int]:
+        """在任一 texts 中出现的最小模式串编号"""
+        found = set()
+        for text in texts:
+            found |= self.find_ids(text)
+        return min(found) if found else None
+
+
+class SubstringScanner:
+    """逐个模式串 `in` 查找，接口同 AhoCorasick；模式串较少时比逐字符推进的自动机快"""
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(enumerate(patterns))
+    
+    def find_ids(self, text: str) -> Set[int]:
+        return {pid for pid, pattern in self.patterns if pattern in text}
+    
+    def first_id(self, texts: Sequence[str]) -> Optional[int]:
+        """在任一 texts 中出现的最小模式串编号（按编号顺序查找，命中即停）"""
+        for pid, pattern in self.patterns:
+            for text in texts:
+                if pattern in text:
+                    return pid
+        return None
+
+
+class TextNormalizer:
+    r"""
+    编译后的文本规范化引擎（normalize_text / clean_title / clean_content），结果与原先逐步
+    re.sub / str.replace 的写法逐字一致，并按输入字符串做有界 LRU 记忆：
+    - 正则全部预编译，相邻的字符类删除合并为一次替换（[\s0-9]+）；
+    - 噪音词及其小写形式预先展开为替换序列，并编译为一个交替正则：文本不含任何噪音词时整段跳过，
+      否则仍按列表顺序逐个 replace（删除后可能拼出新的噪音词，顺序不可交换）。
+    """
+    _BRACKETED = re.compile(r'[\(（].*?[\)）]')
+    _PUNCT = re.compile(r"['\"()（）\[\]【】]")
+    _WHITESPACE = re.compile(r'\s+')
+    _SPACE_DIGITS = re.compile(r'[\s0-9]+')
+    
+    def __init__(self, noise_words: Sequence[str], cache_size: int = 65536, content_cache_size: int = 1024):
+        # 每个噪音词依次 replace 原形与小写形式；空串 replace 为空操作，可去掉
+        self.steps: Tuple[str, ...] = tuple(s for w in noise_words for s in (w, w.lower()) if s)
+        self._noise = re.compile("|".join(map(re.escape, self.steps))) if self.steps else None
+        self._normalize_text = lru_cache(maxsize=cache_size)(self._normalize_text_uncached)
+        self._clean_title = lru_cache(maxsize=cache_size)(self._clean_title_uncached)
+        self._clean_content = lru_cache(maxsize=content_cache_size)(self._clean_content_uncached)
+    
+    def normalize_text(self, text) -> str:
+        return self._normalize_text(text) if isinstance(text, str) else ""
+    
+    def clean_title(self, text) -> str:
+        return self._clean_title(text) if isinstance(text, str) else ""
+    
+    def clean_content(self, text) -> str:
+        return self._clean_content(text) if isinstance(text, str) else ""
+    
+    def _normalize_text_uncached(self, text: str) -> str:
+        return self._WHITESPACE.sub(' ', self._PUNCT.sub('', text.lower().strip()))
+    
+    def _clean_title_uncached(self, text: str) -> str:
+        text = self._BRACKETED.sub('', text)
+        if self._noise is not None and self._noise.search(text):
+            for step in self.steps:
+                text = text.replace(step, "")
+        return self._SPACE_DIGITS.sub('', text)
+    
+    def _clean_content_uncached(self, text: str) -> str:
+        return self._SPACE_DIGITS.sub('', self._BRACKETED.sub('', text))
+    
+    def cache_info(self) -> Dict[str, object]:
+        """各函数的 LRU 命中统计"""
+        return {"normalize_text": self._normalize_text.cache_info(),
+                "clean_title": self._clean_title.cache_info(),
+                "clean_content": self._clean_content.cache_info()}
+
+
+# ==========================================
+# 核心匹配逻辑
+# ==========================================
+class ClauseMatcherLogic:
+    """条款匹配核心逻辑"""
+    
+    config = ClauseConfig
+    AUTOMATON_MIN_PATTERNS = 64   # 模式串少于该数时逐个 `in` 查找更快（见 benchmarks/config_scan.py）
+    COMPILED_SOURCES = ('CLIENT_EN_CN_MAP', 'SEMANTIC_ALIAS_MAP', 'KEYWORD_EXTRACT_MAP', 'EXACT_CLAUSE_MAP',
+                        'NOISE_WORDS', 'NORMALIZE_CACHE_SIZE', 'NORMALIZE_CONTENT_CACHE_SIZE')
+    _automata: Dict[str, Tuple[object, object]] = {}     # 名称 -> (来源配置对象, 编译结果)
+    _compiled_key: Optional[str] = None                  # 编译时 COMPILED_SOURCES 的内容（见 refresh_compiled）
+    _translation_cache: Optional[TranslationCache] = None
+    _match_cache: Optional[MatchResultCache] = None
+    translator = GoogleTranslateBackend() if HAS_TRANSLATOR else None
+    translate_breaker = CircuitBreaker(ClauseConfig.TRANSLATE_BREAKER_THRESHOLD,
+                                       ClauseConfig.TRANSLATE_BREAKER_COOLDOWN)
+    
+    @classmethod
+    def translation_cache(cls) -> Optional[TranslationCache]:
+        """首次使用时打开翻译缓存；无法写入缓存目录时返回 None（不使用缓存）"""
+        if cls._translation_cache is None:
+            try:
+                cls._translation_cache = TranslationCache(
+                    cls.config.TRANSLATION_CACHE_PATH, cls.config.TRANSLATION_CACHE_MAX_ENTRIES)
+            except (OSError, sqlite3.Error):
+                return None
+        return cls._translation_cache
+    
+    @classmethod
+    def match_cache(cls) -> Optional[MatchResultCache]:
+        """首次使用时打开匹配结果缓存；无法写入缓存目录时返回 None（不使用缓存）"""
+        if cls._match_cache is None:
+            try:
+                cls._match_cache = MatchResultCache(
+                    cls.config.MATCH_CACHE_PATH, cls.config.MATCH_CACHE_MAX_ENTRIES)
+            except (OSError, sqlite3.Error):
+                return None
+        return cls._match_cache
+    
+    @classmethod
+    def _compiled(cls, name: str, source: object, build: Callable[[], object]):
+        """
+        按名称缓存由配置编译出的对象，source 为其来源对象（配置字典等）。
+        只比较来源对象的身份（O(1)）：字典被整体替换时重建；原地改动由 refresh_compiled 检测。
+        """
+        slot = cls._automata.get(name)
+        if slot is None or slot[0] is not source:
+            slot = cls._automata[name] = (source, build())
+        return slot[1]
+    
+    @classmethod
+    def refresh_compiled(cls):
+        """
+        配置被原地改动（增删改键值而未整体替换）后丢弃全部编译结果。
+        比较 COMPILED_SOURCES 的内容，只在构建条款库索引等每次运行的入口处调用，不在逐条匹配中检查。
+        """
+        key = repr([getattr(cls.config, name) for name in cls.COMPILED_SOURCES])
+        if cls._compiled_key != key:
+            cls._automata.clear()
+            cls._compiled_key = key
+    
+    @classmethod
+    def _automaton(cls, name: str) -> Tuple[AhoCorasick, list]:
+        """
+        首次使用时把 ClauseConfig 字典编译为自动机，模式串编号即字典顺序；
+        模式串少于 AUTOMATON_MIN_PATTERNS 时改用 SubstringScanner。
+        返回 (自动机, 编号 -> 值)；字典被替换时自动重建。
+        """
+        mapping = getattr(cls.config, name)
+        
+        def build() -> Tuple[AhoCorasick, list]:
+            if name == 'KEYWORD_EXTRACT_MAP':
+                pairs = [(v.lower(), core) for core, variants in mapping.items() for v in variants]
+            elif name == 'SEMANTIC_ALIAS_MAP':
+                pairs = [(alias.lower(), tgt) for alias, tgt in mapping.items()]
+            else:
+                pairs = list(mapping.items())
+            patterns = [p for p, _ in pairs]
+            scanner = AhoCorasick if len(patterns) >= cls.AUTOMATON_MIN_PATTERNS else SubstringScanner
+            return scanner(patterns), pairs
+        
+        return cls._compiled(name, mapping, build)
+    
+    @classmethod
+    def normalizer(cls) -> TextNormalizer:
+        """
+        当前配置的文本规范化引擎，与自动机一样按 NOISE_WORDS 的身份缓存：列表被替换时重建；
+        原地改动与缓存大小变化由 refresh_compiled 检测，重建时旧引擎连同其 LRU 结果一并丢弃。
+        """
+        config = cls.config
+        return cls._compiled('NOISE_WORDS', config.NOISE_WORDS, lambda: TextNormalizer(
+            config.NOISE_WORDS, config.NORMALIZE_CACHE_SIZE, config.NORMALIZE_CONTENT_CACHE_SIZE))
+    
+    @classmethod
+    def _first_hit(cls, name: str, *texts: str) -> Optional[Tuple[str, str]]:
+        """按字典顺序返回首个出现在任一 texts 中的 (键, 值)"""
+        automaton, pairs = cls._automaton(name)
+        pid = automaton.first_id(texts)
+        return None if pid is None else pairs[pid]
+    
+    @classmethod
+    def normalize_text(cls, text: str) -> str:
+        """标准化文本（小写、去空格、去标点）"""
+        return cls.normalizer().normalize_text(text)
+    
+    @classmethod
+    def clean_title(cls, text: str) -> str:
+        """清理标题用于比较：移除括号内容、噪音词、数字和空格"""
+        return cls.normalizer().clean_title(text)
+
+    @classmethod
+    def clean_content(cls, text: str) -> str:
+        """清理内容用于比较：移除括号内容、空白和数字"""
+        return cls.normalizer().clean_content(text)
+
+    @classmethod
+    def extract_extra_info(cls, text: str) -> str:
+        """提取括号内的额外信息（限额等）"""
+        if not isinstance(text, str): 
+            return ""
+        matches = re.findall(r'([\(（].*?[\)）])', text)
+        return " ".join(matches) if matches else ""
+
+    @classmethod
+    def is_english(cls, text: str) -> bool:
+        """判断是否为英文"""
+        if not isinstance(text, str) or len(text) <= 3: 
+            return False
+        zh_count = len(re.findall(r'[\u4e00-\u9fa5]', text))
+        return zh_count < len(text) * 0.15
+
+    @classmethod
+    def glossary_translate(cls, title: str) -> Optional[str]:
+        """仅用客户字典翻译标题，未命中返回 None"""
+        title_norm = cls.normalize_text(title)
+        
+        # 1. 精确匹配客户字典
+        if title_norm in cls.config.CLIENT_EN_CN_MAP:
+            return cls.config.CLIENT_EN_CN_MAP[title_norm]
+        
+        # 2. 部分匹配客户字典（键包含于标题 / 标题包含于键，取字典顺序最靠前者）
+        return cls._partial_glossary_hit(title_norm)
+    
+    @classmethod
+    def translate_title(cls, title: str,
+                        translations: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
+        """
+        翻译英文标题为中文。
+        translations 为预翻译阶段的查找表；提供时不再单独发起在线翻译。
+        """
+        if not cls.is_english(title):
+            return title, False
+        
+        hit = cls.glossary_translate(title)
+        if hit is not None:
+            return hit, True
+        
+        # 3. 使用在线翻译（优先命中翻译缓存）
+        if translations is not None:
+            translated = translations.get(title)
+        else:
+            translated = cls.translate_text(title)
+        if translated:
+            return translated, True
+        
+        return title, False
+    
+    @classmethod
+    def pending_translations(cls, clauses: List[ClauseItem]) -> List[str]:
+        """收集需要在线翻译的标题与内容（客户字典无法覆盖的英文标题及其英文内容）"""
+        texts = []
+        for clause in clauses:
+            if not cls.is_english(clause.title):
+                continue
+            if cls.glossary_translate(clause.title) is None:
+                texts.append(clause.title)
+            if clause.content and cls.is_english(clause.content):
+                texts.append(clause.content)
+        return texts
+    
+    @classmethod
+    def translate_text(cls, text: str) -> Optional[str]:
+        """在线翻译为中文，结果写入翻译缓存；失败时返回 None"""
+        config = cls.config
+        backend = cls.translator
+        provider = backend.name if backend is not None else GoogleTranslateBackend.name
+        cache = cls.translation_cache()
+        if cache is not None:
+            cached = cache.get(text, provider, config.TRANSLATE_TARGET)
+            if cached is not None:
+                return cached
+        
+        if backend is None or cls.translate_breaker.is_open:
+            return None
+        try:
+            translated = call_with_deadline(
+                backend.translate, config.TRANSLATE_CALL_TIMEOUT, text, config.TRANSLATE_TARGET)
+        except Exception:
+            cls.translate_breaker.record_failure()
+            return None
+        cls.translate_breaker.record_success()
+        if translated and cache is not None:
+            cache.put(text, provider, config.TRANSLATE_TARGET, translated)
+        return translated
+
+    @classmethod
+    def _partial_glossary_hit(cls, title_norm: str) -> Optional[str]:
+        """客户字典部分匹配：自动机找出标题中包含的键，拼接串查找包含标题的键"""
+        automaton, pairs = cls._automaton('CLIENT_EN_CN_MAP')
+        hits = automaton.find_ids(title_norm)
+        
+        # 所有键以 \x00 拼接，首个出现位置即字典顺序最靠前的包含标题的键；随自动机的 pairs 一同重建
+        def build() -> Tuple[str, List[int]]:
+            offsets, pos = [], 0
+            for eng, _ in pairs:
+                offsets.append(pos)
+                pos += len(eng) + 1
+            return "\x00".join(eng for eng, _ in pairs), offsets
+        
+        joined, offsets = cls._compiled('CLIENT_EN_CN_MAP.joined', pairs, build)
+        pos = joined.find(title_norm)
+        if pos >= 0:
+            hits.add(bisect.bisect_right(offsets, pos) - 1)
+        
+        return pairs[min(hits)][1] if hits else None
+
+    @classmethod
+    def extract_keywords(cls, text: str) -> Set[str]:
+        """从文本中提取关键词"""
+        automaton, pairs = cls._automaton('KEYWORD_EXTRACT_MAP')
+        return {pairs[pid][1] for pid in automaton.find_ids(text.lower())}
+    
+    @classmethod
+    def check_semantic_alias(cls, title: str) -> Optional[str]:
+        """检查语义别名匹配"""
+        title_clean = title.replace(" ", "").lower()
+        hit = cls._first_hit('SEMANTIC_ALIAS_MAP', title_clean)
+        return hit[1] if hit else None
+    
+    @classmethod
+    def find_exact_clause_target(cls, title: str, title_clean: str) -> Optional[str]:
+        """精确条款名映射：按字典顺序返回首个出现在标题中的映射目标"""
+        hit = cls._first_hit('EXACT_CLAUSE_MAP', title, title_clean)
+        return hit[1] if hit else None
+
+    @classmethod
+    def calculate_similarity(cls, text1: str, text2: str) -> float:
+        """计算文本相似度"""
+        if not text1 or not text2:
+            return 0.0
+        return difflib.SequenceMatcher(None, text1, text2).ratio()
+
+    @staticmethod
+    def apply_penalty(score: float, title: str, penalty_words: Tuple[str, ...]) -> float:
+        """惩罚项：库条款含惩罚关键词（penalty_words）而客户标题不含时扣分"""
+        for bad_word in penalty_words:
+            if bad_word not in title:
+                score -= 0.5
+        return score
+
+    @classmethod
+    def fuzzy_score(cls, title: str, title_clean: str, c_content_clean: str,
+                    library: 'LibraryIndex', row: int, use_content: bool,
+                    threshold: Optional[float] = None,
+                    content_estimate: Optional[float] = None) -> Optional[Tuple[float, float, float]]:
+        """
+        客户条款与条款库第 row 条的模糊匹配得分 (score, title_sim, content_sim)，已计入惩罚项。
+        给定 threshold 时按上界逐级剪枝：长度比上界 -> quick_ratio 上界 -> 标题完整 ratio，
+        任一阶段 0.7/0.3 加权后的上界 <= threshold 即返回 None（该候选不可能胜出）。
+        各上界与 ratio 使用相同的 2*M/T 计算，剪枝不改变最终结果。
+        content_estimate 为 MinHash 估计的正文相似度，给定时直接作为 content_sim，不再比对正文。
+        """
+        penalty_words = library.penalty_words[row]
+        
+        def combine(t: float, c: float) -> float:
+            score = 0.7 * t + 0.3 * c if use_content else t
+            return cls.apply_penalty(score, title, penalty_words)
+        
+        name_clean = library.names_clean[row]
+        l_content_clean = library.contents_clean[row]
+        has_title = bool(title_clean and name_clean)
+        has_content = use_content and bool(c_content_clean and l_content_clean)
+        estimated = has_content and content_estimate is not None
+        
+        if threshold is None:
+            title_sim = cls.calculate_similarity(title_clean, name_clean)
+            if estimated:
+                content_sim = content_estimate
+            else:
+                content_sim = cls.calculate_similarity(c_content_clean, l_content_clean) if has_content else 0.0
+            return combine(title_sim, content_sim), title_sim, content_sim
+        
+        # 1. 长度比上界（等价于 real_quick_ratio，无需构建 SequenceMatcher）
+        la, lb = len(title_clean), len(name_clean)
+        t_ub = 2.0 * min(la, lb) / (la + lb) if has_title else 0.0
+        c_ub = 0.0
+        if estimated:
+            c_ub = content_estimate
+        elif has_content:
+            la, lb = len(c_content_clean), len(l_content_clean)
+            c_ub = 2.0 * min(la, lb) / (la + lb)
+        if combine(t_ub, c_ub) <= threshold:
+            return None
+        
+        # 2. quick_ratio 上界（字符多重集交集）
+        t_sm = difflib.SequenceMatcher(None, title_clean, name_clean) if has_title else None
+        t_ub = t_sm.quick_ratio() if t_sm else 0.0
+        c_sm = difflib.SequenceMatcher(None, c_content_clean, l_content_clean) if has_content and not estimated else None
+        if c_sm:
+            c_ub = c_sm.quick_ratio()
+        if combine(t_ub, c_ub) <= threshold:
+            return None
+        
+        # 3. 标题完整 ratio + 内容上界
+        title_sim = t_sm.ratio() if t_sm else 0.0
+        if c_sm and combine(title_sim, c_ub) <= threshold:
+            return None
+        content_sim = c_sm.ratio() if c_sm else c_ub
+        return combine(title_sim, content_sim), title_sim, content_sim
+
+    @classmethod
+    def match_clause(cls, clause: ClauseItem, library: 'LibraryIndex',
+                     is_title_only: bool, shortlist: Optional[List[int]] = None,
+                     top_k: Optional[int] = None) -> MatchResult:
+        """
+        多级匹配策略：
+        1. 精确条款名映射
+        2. 精确匹配（翻译后直接匹配）
+        3. 语义别名匹配
+        4. 关键词匹配
+        5. 模糊匹配
+        
+        shortlist 为批量引擎预先召回的模糊候选下标；为 None 时使用 n-gram 倒排召回。
+        top_k 为额外保留的备选数（默认 MATCH_ALTERNATIVES），在同一次候选遍历中用小顶堆收集；
+        哈希直达的精确命中不遍历条款库，因此没有备选。
+        候选按下标直接读取 LibraryIndex 的各列。
+        """
+        if not isinstance(library, LibraryIndex):
+            library = LibraryIndex(library)
+        
+        result = MatchResult()
+        title = clause.title
+        content = clause.content
+        
+        # 准备清理后的标题
+        title_clean = cls.clean_title(title)
+        title_norm = cls.normalize_text(title)
+        use_content = not is_title_only and bool(content.strip())
+        c_content_clean = cls.clean_content(content) if use_content else ""
+        
+        best_score = -100
+        best_match = None
+        best_meta = {'t': 0, 'c': 0, 'level': MatchLevel.NONE}
+        
+        # 提取客户条款关键词
+        c_keywords = cls.extract_keywords(title)
+        
+        # 检查语义别名
+        semantic_target = cls.check_semantic_alias(title)
+        
+        # 检查精确条款名映射
+        exact_target = cls.find_exact_clause_target(title, title_clean)
+        
+        # === 级别0: 精确条款名映射（哈希直达）===
+        row = library.find_exact_target(exact_target) if exact_target else None
+        if row is not None:
+            best_score = 0.98
+            best_match = row
+            best_meta = {'t': 0.98, 'c': 0, 'level': MatchLevel.EXACT}
+        else:
+            # === 级别1: 精确匹配（哈希直达）===
+            row = library.find_exact_title(title_clean, title_norm, title)
+            if row is not None:
+                best_score = 1.0
+                best_match = row
+                best_meta = {'t': 1.0, 'c': 0, 'level': MatchLevel.EXACT}
+        
+        # 候选集：精确/语义/关键词命中 + n-gram 召回的模糊候选（保持库内顺序）
+        # 正文 MinHash：客户条款签名算一次，候选条目的 Jaccard 估计一次性向量化计算
+        minhash = library.minhash
+        c_signature = None
+        if best_match is None and minhash is not None and use_content and minhash.applies(c_content_clean):
+            c_signature = minhash.signature(c_content_clean)
+        
+        rows = [] if best_match is not None else library.candidate_rows(
+            title_clean, title_norm, c_content_clean, semantic_target, c_keywords, shortlist, c_signature)
+        result.candidates_scored = len(rows)
+        content_estimates: Dict[int, float] = {}
+        if c_signature is not None:
+            ids = [i for i in rows if minhash.has_signature[i]]
+            content_estimates = dict(zip(ids, minhash.similarities(c_signature, ids)))
+        
+        names, names_clean, names_norm = library.names, library.names_clean, library.names_norm
+        keywords, penalty_words = library.keywords, library.penalty_words
+        
+        # 小顶堆保留前 k 名 (得分, -序号, ...)：同分时库内靠前者优先，与逐条比较“严格大于才替换”一致
+        k = 1 + max(0, cls.config.MATCH_ALTERNATIVES if top_k is None else top_k)
+        top = []
+        for order, row in enumerate(rows):
+            score = 0.0
+            title_sim = content_sim = 0.0
+            match_level = MatchLevel.FUZZY
+            
+            # === 级别1: 精确匹配（带惩罚项的精确命中仍参与比较）===
+            if title_clean == names_clean[row] or title_norm == names_norm[row]:
+                score = 1.0
+                match_level = MatchLevel.EXACT
+            
+            # === 级别2: 语义别名匹配 ===
+            elif semantic_target and semantic_target in names[row]:
+                score = 0.95
+                match_level = MatchLevel.SEMANTIC
+            
+            else:
+                # === 级别3: 关键词匹配 ===
+                l_keywords = keywords[row]
+                if c_keywords and l_keywords:
+                    common = c_keywords & l_keywords
+                    if common:
+                        keyword_score = len(common) / max(len(c_keywords), len(l_keywords))
+                        if keyword_score >= 0.5:
+                            score = 0.7 + keyword_score * 0.2
+                            match_level = MatchLevel.KEYWORD
+                
+                # === 级别4: 模糊匹配 ===
+                if score < 0.7:
+                    # 低于 0.15 的结果不会输出，可一并剪枝
+                    kth_score = top[0][0] if len(top) >= k else best_score
+                    threshold = max(kth_score, 0.15) if cls.config.FUZZY_PRUNING else None
+                    scored = cls.fuzzy_score(title, title_clean, c_content_clean, library, row,
+                                             use_content, threshold, content_estimates.get(row))
+                    if scored is None:
+                        continue
+                    score, title_sim, content_sim = scored
+                    match_level = MatchLevel.FUZZY
+            
+            # 惩罚项（模糊匹配的惩罚已在 fuzzy_score 中计入）
+            if match_level != MatchLevel.FUZZY:
+                score = cls.apply_penalty(score, title, penalty_words[row])
+            
+            if match_level == MatchLevel.FUZZY:
+                meta = {'t': title_sim, 'c': content_sim, 'level': match_level}
+            else:
+                meta = {'t': score, 'c': 0, 'level': match_level}
+            item = (score, -order, row, meta)
+            if len(top) < k:
+                heapq.heappush(top, item)
+            elif item[:2] > top[0][:2]:
+                heapq.heapreplace(top, item)
+        
+        ranked = sorted(top, key=lambda x: x[:2], reverse=True)
+        if ranked:
+            best_score, _, best_match, best_meta = ranked[0]
+        
+        # 构建结果
+        if best_match is not None and best_score > 0.15:
+            base_name = library.names[best_match]
+            extra_params = cls.extract_extra_info(clause.original_title or clause.title)
+            
+            result.matched_name = f"{base_name} {extra_params}".strip() if extra_params else base_name
+            result.matched_content = library.contents[best_match]
+            result.matched_reg = library.regs[best_match]
+            result.score = max(0, best_score)
+            result.title_score = best_meta.get('t', 0)
+            result.content_score = best_meta.get('c', 0)
+            result.match_level = best_meta.get('level', MatchLevel.FUZZY)
+            
+            # 差异分析
+            if best_score < 0.6:
+                result.diff_analysis = cls.analyze_difference(content, result.matched_content)
+            
+            # 备选条款（同样要求得分 > 0.15）
+            for alt_score, _, alt_row, alt_meta in ranked[1:]:
+                if alt_score <= 0.15:
+                    break
+                result.alternatives.append(MatchCandidate(
+                    name=library.names[alt_row],
+                    reg=library.regs[alt_row],
+                    score=alt_score,
+                    match_level=alt_meta['level'],
+                ))
+        
+        return result
+
+    @classmethod
+    def match_many(cls, clauses: List[ClauseItem], library: 'LibraryIndex', is_title_only: bool,
+                   shortlists: Optional[List[Optional[List[int]]]] = None, processes: int = 0,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   pool: Optional[ProcessPoolExecutor] = None,
+                   clause_times: Optional[List[float]] = None) -> List[MatchResult]:
+        """
+        批量匹配，结果与 clauses 顺序一致。
+        processes > 1（或 -1 表示 CPU 核数）且条款足够多时使用进程池：
+        条款库索引经 initializer 每个进程只传输一次，任务只传条款本身。
+        pool 为调用方持有、已用 match_pool(library) 创建的进程池，可跨多次调用（多份文档）复用。
+        clause_times 非 None 时按条款顺序追加每条 match_clause 的耗时（秒）。
+        """
+        total = len(clauses)
+        shortlists = shortlists or [None] * total
+        if pool is None:
+            if processes < 0:
+                processes = os.cpu_count() or 1
+            processes = min(processes, total)
+            if processes <= 1 or total < cls.config.MATCH_PARALLEL_MIN_CLAUSES:
+                results = []
+                for idx, clause in enumerate(clauses, 1):
+                    if progress:
+                        progress(idx, total)
+                    if clause_times is None:
+                        results.append(cls.match_clause(clause, library, is_title_only, shortlists[idx - 1]))
+                        continue
+                    start = time.perf_counter()
+                    results.append(cls.match_clause(clause, library, is_title_only, shortlists[idx - 1]))
+                    clause_times.append(time.perf_counter() - start)
+                return results
+            with cls.match_pool(library, processes) as pool:
+                return cls.match_many(clauses, library, is_title_only, shortlists,
+                                      progress=progress, pool=pool, clause_times=clause_times)
+        
+        results: List[Optional[MatchResult]] = [None] * total
+        seconds = [0.0] * total
+        futures = {pool.submit(_match_in_process, clause, is_title_only, shortlists[i]): i
+                   for i, clause in enumerate(clauses)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            results[i], seconds[i] = future.result()
+            if progress:
+                progress(done, total)
+        if clause_times is not None:
+            clause_times.extend(seconds)
+        return results
+
+    @classmethod
+    def match_pool(cls, library: 'LibraryIndex', processes: int, mp_context=None) -> ProcessPoolExecutor:
+        """
+        创建匹配进程池：每个工作进程经 initializer 接收一次条款库索引与当前配置快照。
+        spawn 启动方式（macOS / Windows 默认）下工作进程重新导入模块，运行时改过的配置须随之传入。
+        """
+        return ProcessPoolExecutor(max_workers=processes, mp_context=mp_context,
+                                   initializer=_init_match_process,
+                                   initargs=(cls, library, cls.config.snapshot()))
+
+    @classmethod
+    def analyze_difference(cls, c_content: str, l_content: str) -> str:
+        """分析保障差异"""
+        c_text, l_text = str(c_content), str(l_content)
+        if not c_text.strip(): 
+            return ""
+
+        analysis = []
+        keywords = {
+            "限额": ["Limit", "限额", "最高", "limit"],
+            "免赔": ["Deductible", "Excess", "免赔", "deductible"],
+            "除外": ["Exclusion", "除外", "不负责", "exclusion"],
+            "观察期": ["Waiting Period", "观察期", "等待期"],
+            "赔偿期": ["Indemnity Period", "赔偿期间"],
+        }
+        
+        for key, words in keywords.items():
+            c_has = any(w.lower() in c_text.lower() for w in words)
+            l_has = any(w.lower() in l_text.lower() for w in words)
+            if c_has and not l_has: 
+                analysis.append(f"⚠️ 客户提及[{key}]但库内未提及")
+            elif not c_has and l_has: 
+                analysis.append(f"ℹ️ 库内包含[{key}]但客户未提及")
+
+        return " | ".join(analysis)
+
+    @classmethod
+    def is_likely_title(cls, text: str) -> bool:
+        """判断是否像标题"""
+        if len(text) > 80: 
+            return False
+        if text.endswith(('。', '；', '.', ';')): 
+            return False
+        title_indicators = ["条款", "Clause", "Extension", "险", "CLAUSE", "EXTENSION"]
+        if any(kw in text for kw in title_indicators):
+            return True
+        # 全大写英文通常是标题
+        if text.isupper() and len(text) > 5:
+            return True
+        return True
+
+    @classmethod
+    def parse_docx(cls, doc_path: str) -> Tuple[List[ClauseItem], bool]:
+        """解析Word文档，提取条款"""
+        clauses = []
+        current_block = []
+        
+        all_lines = [text.strip() for text in iter_docx_paragraphs(
+            doc_path, include_tables=cls.config.DOCX_INCLUDE_TABLES)]
+        empty_lines = sum(1 for t in all_lines if not t)
+        
+        # 智能分割策略
+        use_smart_split = len(all_lines) > 0 and (empty_lines / max(len(all_lines), 1) < 0.05)
+        
+        if use_smart_split:
+            for text in all_lines:
+                if not text: 
+                    continue
+                if current_block and cls.is_likely_title(text):
+                    title = current_block[0]
+                    content = "\n".join(current_block[1:])
+                    clauses.append(ClauseItem(title=title, content=content, original_title=title))
+                    current_block = [text]
+                else:
+                    current_block.append(text)
+            if current_block:
+                clauses.append(ClauseItem(
+                    title=current_block[0], 
+                    content="\n".join(current_block[1:]),
+                    original_title=current_block[0]
+                ))
+        else:
+            for text in all_lines:
+                if text:
+                    current_block.append(text)
+                elif current_block:
+                    clauses.append(ClauseItem(
+                        title=current_block[0], 
+                        content="\n".join(current_block[1:]),
+                        original_title=current_block[0]
+                    ))
+                    current_block = []
+            if current_block:
+                clauses.append(ClauseItem(
+                    title=current_block[0], 
+                    content="\n".join(current_block[1:]),
+                    original_title=current_block[0]
+                ))
+        
+        is_title_only = all(not c.content for c in clauses)
+        return clauses, is_title_only
+
+
+# ==========================================
+# 条款库索引：一次性预计算所有比较用字段
+# ==========================================
+class LibraryIndex:
+    """
+    条款库索引 - 构建一次，供所有客户条款复用。
+    lib_data 为行字典列表（'条款名称' / '条款内容' / '产品注册号'）；
+    已按列读取的数据用 from_columns 构建，不必先拼成逐行字典。
+    
+    每条记录的字段按列存放（names / contents / regs / names_clean / names_norm / keywords /
+    contents_clean / penalty_words 为等长 list，n-gram 计数为 32 位整数数组），下标即条目序号；
+    名称类字段已驻留，相同关键词集合共用同一 frozenset；不逐行建对象，查找方法返回条目下标。
+    """
+    
+    def __init__(self, lib_data: List[Dict], logic=None):
+        self._build(
+            [lib.get('条款名称', '') for lib in lib_data],
+            [lib.get('条款内容', '') for lib in lib_data],
+            [lib.get('产品注册号', lib.get('注册号', '')) for lib in lib_data],
+            logic)
+    
+    @classmethod
+    def from_columns(cls, names: Sequence[str], contents: Sequence[str], regs: Sequence[str],
+                     logic=None) -> 'LibraryIndex':
+        """按列构建：三列等长，下标即条目序号"""
+        index = cls.__new__(cls)
+        index._build(names, contents, regs, logic)
+        return index
+    
+    def _build(self, names: Sequence[str], contents: Sequence[str], regs: Sequence[str], logic):
+        self.logic = logic or ClauseMatcherLogic
+        self.logic.refresh_compiled()
+        self._build_columns(names, contents, regs)
+        
+        # 条款库指纹：名称 / 内容 / 注册号任一变化都会改变，用作匹配结果缓存键的一部分
+        digest = hashlib.sha256()
+        for name, content, reg in zip(self.names, self.contents, self.regs):
+            digest.update("\x1f".join((name, content, str(reg))).encode("utf-8") + b"\x1e")
+        self.fingerprint = digest.hexdigest()
+        
+        # 精确匹配哈希表：清理后标题 / 标准化标题 -> 条目下标（保持库内顺序）
+        self.by_clean: Dict[str, List[int]] = {}
+        self.by_norm: Dict[str, List[int]] = {}
+        for i, (name_clean, name_norm) in enumerate(zip(self.names_clean, self.names_norm)):
+            self.by_clean.setdefault(name_clean, []).append(i)
+            self.by_norm.setdefault(name_norm, []).append(i)
+        
+        # 精确条款名映射目标 -> 首个包含该名称的条目下标
+        self.exact_targets: Dict[str, Optional[int]] = {}
+        for target in self.logic.config.EXACT_CLAUSE_MAP.values():
+            self.exact_targets[target] = next(
+                (i for i, name in enumerate(self.names) if target in name), None)
+        
+        # 关键词倒排：核心关键词 -> 条目下标
+        self.by_keyword: Dict[str, List[int]] = {}
+        for i, keywords in enumerate(self.keywords):
+            for kw in keywords:
+                self.by_keyword.setdefault(kw, []).append(i)
+        self._containing: Dict[str, List[int]] = {}
+        
+        # 字符 n-gram 倒排：标题 / 内容。倒排表用 32 位整数数组（每个下标 4 字节，list 为 8 字节指针）；
+        # 内容 n-gram 出现在超过 NGRAM_MAX_DF_RATIO 的条目中时召回阶段本就忽略，建完即丢弃
+        config = self.logic.config
+        self.title_postings: Dict[str, 'array[int]'] = {}
+        self.content_postings: Dict[str, 'array[int]'] = {}
+        self.n_title_grams = array('i')
+        self.n_content_grams = array('i')
+        for i, (name_clean, content_clean) in enumerate(zip(self.names_clean, self.contents_clean)):
+            grams = self.ngrams(name_clean, config.TITLE_NGRAM_SIZES)
+            self.n_title_grams.append(len(grams))
+            for g in grams:
+                posting = self.title_postings.get(g)
+                if posting is None:
+                    posting = self.title_postings[g] = array('i')
+                posting.append(i)
+            grams = self.ngrams(content_clean, config.CONTENT_NGRAM_SIZES)
+            self.n_content_grams.append(len(grams))
+            for g in grams:
+                posting = self.content_postings.get(g)
+                if posting is None:
+                    posting = self.content_postings[g] = array('i')
+                posting.append(i)
+        max_df = self.max_content_df()
+        self.content_postings = {g: p for g, p in self.content_postings.items() if len(p) <= max_df}
+        
+        # 近似重复簇的代表条目（见 use_representatives），None 表示逐条检索全部条目
+        self.representative: Optional['array[int]'] = None
+        
+        # 正文 MinHash 签名与 LSH 分桶（仅在启用且装有 numpy 时构建）
+        self.minhash: Optional[MinHashIndex] = None
+        if config.CONTENT_SIMILARITY != "difflib" and HAS_NUMPY:
+            self.minhash = MinHashIndex(self.contents_clean, config)
+    
+    def _build_columns(self, names: Sequence[str], contents: Sequence[str], regs: Sequence[str]):
+        """逐行计算比较用字段，按列追加"""
+        logic = self.logic
+        penalty_keywords = logic.config.PENALTY_KEYWORDS
+        keyword_sets: Dict[FrozenSet[str], FrozenSet[str]] = {}
+        self.names: List[str] = []
+        self.contents: List[str] = []
+        self.regs: List[str] = []
+        self.names_clean: List[str] = []
+        self.names_norm: List[str] = []
+        self.keywords: List[FrozenSet[str]] = []
+        self.contents_clean: List[str] = []
+        self.penalty_words: List[Tuple[str, ...]] = []
+        for name, content, reg in zip(names, contents, regs):
+            name = sys.intern(str(name))
+            content = str(content)
+            keywords = frozenset(logic.extract_keywords(name))
+            self.names.append(name)
+            self.contents.append(content)
+            self.regs.append(sys.intern(reg) if isinstance(reg, str) else reg)
+            self.names_clean.append(sys.intern(logic.clean_title(name)))
+            self.names_norm.append(sys.intern(logic.normalize_text(name)))
+            self.keywords.append(keyword_sets.setdefault(keywords, keywords))
+            self.contents_clean.append(logic.clean_content(content))
+            self.penalty_words.append(tuple(w for w in penalty_keywords if w in name))
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def use_representatives(self, representative: Sequence[int]):
+        """
+        representative[i] 为条目 i 所在近似重复簇的代表条目下标。
+        此后只有模糊召回（n-gram / LSH，或 FUZZY_BRUTE_FORCE 的全量扫描）的候选折叠为代表条目，同簇变体不再重复评分；
+        精确标题、EXACT_CLAUSE_MAP、语义别名与关键词命中的条目保持原样，客户写明的版本不会被换成代表条目。
+        指纹随之改变，匹配结果缓存不会与未去重时混用。
+        """
+        if len(representative) != len(self.names):
+            raise ValueError("去重索引与条款库条数不一致")
+        self.representative = array('i', representative)
+        self.fingerprint = hashlib.sha256(
+            self.fingerprint.encode("ascii") + self.representative.tobytes()).hexdigest()
+    
+    def find_exact_target(self, target: str) -> Optional[int]:
+        """EXACT_CLAUSE_MAP 目标名称 -> 首个包含它的条目下标"""
+        if target not in self.exact_targets:
+            self.exact_targets[target] = next(
+                (i for i, name in enumerate(self.names) if target in name), None)
+        return self.exact_targets[target]
+    
+    def max_content_df(self) -> int:
+        """内容 n-gram 的最大文档频数，超过者不参与召回"""
+        return max(1, int(len(self.names) * self.logic.config.NGRAM_MAX_DF_RATIO))
+    
+    @staticmethod
+    def ngrams(text: str, sizes: Tuple[int, ...]) -> Set[str]:
+        """字符 n-gram 集合；短于最小 n 的文本整体作为一个 gram"""
+        grams = set()
+        for n in sizes:
+            grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+        if not grams and text:
+            grams.add(text)
+        return grams
+    
+    def find_containing(self, text: str) -> List[int]:
+        """名称中包含 text 的条目下标（按查询文本缓存）"""
+        if text not in self._containing:
+            self._containing[text] = [i for i, name in enumerate(self.names) if text in name]
+        return self._containing[text]
+    
+    def fuzzy_candidates(self, title_clean: str, content_clean: str = "",
+                         limit: Optional[int] = None) -> List[int]:
+        """
+        n-gram 倒排召回：按 Dice 系数估计 0.7/0.3 加权相似度，返回前 limit 个条目下标。
+        仅召回与客户条款至少共享一个 n-gram 的条目。
+        """
+        config = self.logic.config
+        limit = config.FUZZY_CANDIDATE_LIMIT if limit is None else limit
+        
+        t_grams = self.ngrams(title_clean, config.TITLE_NGRAM_SIZES)
+        t_hits = Counter()
+        for g in t_grams:
+            t_hits.update(self.title_postings.get(g, ()))
+        
+        c_grams = self.ngrams(content_clean, config.CONTENT_NGRAM_SIZES) if content_clean else set()
+        c_hits = Counter()
+        max_df = self.max_content_df()
+        for g in c_grams:
+            posting = self.content_postings.get(g, ())
+            if len(posting) <= max_df:
+                c_hits.update(posting)
+        
+        n_title_grams, n_content_grams = self.n_title_grams, self.n_content_grams
+        
+        def estimate(i: int) -> float:
+            t = 2 * t_hits[i] / (len(t_grams) + n_title_grams[i]) if t_grams else 0.0
+            if not content_clean:
+                return t
+            c = 2 * c_hits[i] / (len(c_grams) + n_content_grams[i]) if c_grams else 0.0
+            return 0.7 * t + 0.3 * c
+        
+        return heapq.nlargest(limit, set(t_hits) | set(c_hits), key=estimate)
+    
+    def candidate_rows(self, title_clean: str, title_norm: str, content_clean: str,
+                   semantic_target: Optional[str], keywords: Set[str],
+                   fuzzy: Optional[List[int]] = None,
+                   content_signature=None) -> List[int]:
+        """
+        需要逐条评分的候选条目下标（保持库内顺序）；fuzzy 为外部召回的模糊候选，
+        content_signature 为客户条款正文的 MinHash 签名，给定时另加入 LSH 同桶条目。
+        已去重时只有模糊候选折叠为代表条目（见 use_representatives）。
+        """
+        brute_force = self.logic.config.FUZZY_BRUTE_FORCE
+        if brute_force and self.representative is None:
+            return list(range(len(self.names)))
+        picked = set(self.by_clean.get(title_clean, ()))
+        picked.update(self.by_norm.get(title_norm, ()))
+        if semantic_target:
+            picked.update(self.find_containing(semantic_target))
+        for kw in keywords:
+            picked.update(self.by_keyword.get(kw, ()))
+        if brute_force:
+            picked.update(self.representative)
+            return sorted(picked)
+        if fuzzy is None:
+            fuzzy = self.fuzzy_candidates(title_clean, content_clean)
+        similar = set(fuzzy)
+        if content_signature is not None:
+            similar.update(self.minhash.candidates(content_signature))
+        if self.representative is not None:
+            similar = {self.representative[i] for i in similar}
+        picked.update(similar)
+        return sorted(picked)
+    
+    def find_exact_title(self, title_clean: str, title_norm: str,
+                         title: str) -> Optional[int]:
+        """
+        按清理/标准化标题哈希查找精确命中。
+        仅返回不触发惩罚项的首个条目下标；否则返回 None 交由逐条比较处理。
+        """
+        hits = set(self.by_clean.get(title_clean, ()))
+        hits.update(self.by_norm.get(title_norm, ()))
+        for i in sorted(hits):
+            if all(w in title for w in self.penalty_words[i]):
+                return i
+        return None
+
+
+class LibraryCache:
+    """
+    条款库二进制缓存：LibraryIndex 以 pickle 保存在本用户的 LIBRARY_CACHE_DIR 下，文件名含工作簿路径哈希；
+    以 工作簿路径 / 大小 / 修改时间 / 内容 SHA-256 及配置摘要为键，任一不符即重新解析。
+    文件先写表头再写索引，校验表头时无需反序列化整个索引。
+    反序列化 pickle 可执行任意代码，因此缓存不能放在他人可写的位置（如共享盘上工作簿所在的文件夹）。
+    """
+    FORMAT_VERSION = 6   # LibraryIndex 结构变化时递增
+    
+    def __init__(self, workbook_path: str, config=ClauseConfig):
+        self.workbook_path = os.path.abspath(workbook_path)
+        name = os.path.basename(self.workbook_path)
+        path_hash = hashlib.sha1(self.workbook_path.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(config.LIBRARY_CACHE_DIR, f"{name}.{path_hash}{config.LIBRARY_CACHE_SUFFIX}")
+        self.config_fingerprint = config.fingerprint()
+    
+    def _key(self) -> Dict:
+        st = os.stat(self.workbook_path)
+        digest = hashlib.sha256()
+        with open(self.workbook_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return {
+            "version": self.FORMAT_VERSION,
+            "path": self.workbook_path,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": digest.hexdigest(),
+            "config": self.config_fingerprint,
+        }
+    
+    def load(self) -> Optional[LibraryIndex]:
+        """命中时返回缓存的索引；缓存不存在、已失效或损坏时返回 None"""
+        try:
+            with open(self.path, "rb") as f:
+                if pickle.load(f) != self._key():
+                    return None
+                return pickle.load(f)
+        except Exception:
+            return None
+    
+    def save(self, index: LibraryIndex) -> bool:
+        """写入缓存（先写临时文件再替换）；目录不可写等情况返回 False"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._key(), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            return False
+
+
+class BatchTfidfMatcher:
+    """
+    批量 TF-IDF 召回引擎：
+    整篇文档的客户条款与条款库分别转为字符 n-gram TF-IDF 稀疏矩阵，
+    一次稀疏矩阵乘积得到全部余弦相似度，再用 argpartition 取每条的前 k 个候选。
+    精确 / 语义 / 关键词层级仍由 match_clause 在候选之上处理。
+    """
+    # 得分矩阵每格的峰值字节数：两个稀疏乘积及其和（float64 + int32 列号）、稠密化的 float64、
+    # argpartition 的 int64 下标，按最坏情况（稀疏乘积接近稠密）估计
+    BYTES_PER_SCORE = 32
+    
+    def __init__(self, library: LibraryIndex, top_k: Optional[int] = None):
+        if not HAS_SCIPY:
+            raise RuntimeError("批量 TF-IDF 模式需要安装 numpy 和 scipy")
+        self.library = library
+        self.logic = library.logic
+        config = self.logic.config
+        self.top_k = config.FUZZY_CANDIDATE_LIMIT if top_k is None else top_k
+        
+        self.title_vocab: Dict[str, int] = {}
+        self.content_vocab: Dict[str, int] = {}
+        self.title_idf, self.lib_title = self._fit(
+            library.names_clean, config.TITLE_NGRAM_SIZES, self.title_vocab)
+        self.content_idf, self.lib_content = self._fit(
+            library.contents_clean, config.CONTENT_NGRAM_SIZES, self.content_vocab)
+    
+    @staticmethod
+    def _gram_counts(text: str, sizes: Tuple[int, ...]) -> Counter:
+        counts = Counter()
+        for n in sizes:
+            counts.update(text[i:i + n] for i in range(len(text) - n + 1))
+        if not counts and text:
+            counts[text] = 1
+        return counts
+    
+    def _fit(self, texts: List[str], sizes: Tuple[int, ...], vocab: Dict[str, int]):
+        """建立词表与 IDF，返回 (idf, 已 L2 归一化的库矩阵)"""
+        import numpy as np
+        docs = [self._gram_counts(t, sizes) for t in texts]
+        df = Counter()
+        for counts in docs:
+            for g in counts:
+                if g not in vocab:
+                    vocab[g] = len(vocab)
+            df.update(counts.keys())
+        n_docs = len(texts)
+        idf = np.ones(len(vocab))
+        for g, col in vocab.items():
+            idf[col] = np.log((1 + n_docs) / (1 + df[g])) + 1
+        return idf, self._transform(docs, vocab, idf)
+    
+    @staticmethod
+    def _transform(docs: List[Counter], vocab: Dict[str, int], idf):
+        """n-gram 计数 -> 已 L2 归一化的 TF-IDF 稀疏矩阵（scipy.sparse CSR，按需导入）"""
+        import numpy as np
+        from scipy import sparse
+        indptr, indices, data = [0], [], []
+        for counts in docs:
+            for g, tf in counts.items():
+                col = vocab.get(g)
+                if col is not None:
+                    indices.append(col)
+                    data.append(1 + np.log(tf))
+            indptr.append(len(indices))
+        mat = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(docs), len(vocab)))
+        mat = mat.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(mat.multiply(mat).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ mat
+    
+    def shortlist(self, clauses: List[ClauseItem], is_title_only: bool) -> List[List[int]]:
+        """为每条客户条款返回前 top_k 个候选库条目下标（相似度为 0 的不召回）"""
+        import numpy as np
+        from scipy import sparse
+        logic = self.logic
+        config = logic.config
+        if not clauses or not len(self.library) or self.top_k <= 0:
+            return [[] for _ in clauses]
+        
+        titles = [self._gram_counts(logic.clean_title(c.title), config.TITLE_NGRAM_SIZES) for c in clauses]
+        use_content = [not is_title_only and bool(c.content.strip()) for c in clauses]
+        contents = [self._gram_counts(logic.clean_content(c.content), config.CONTENT_NGRAM_SIZES)
+                    if u else Counter() for c, u in zip(clauses, use_content)]
+        q_title = self._transform(titles, self.title_vocab, self.title_idf)
+        q_content = self._transform(contents, self.content_vocab, self.content_idf)
+        w_title = np.where(use_content, 0.7, 1.0)
+        w_content = np.where(use_content, 0.3, 0.0)
+        
+        n_library = len(self.library)
+        k = min(self.top_k, n_library)
+        # 每块行数由库条数决定：库越大每块行数越少，峰值内存不随库规模增长
+        chunk_rows = max(1, config.BATCH_CHUNK_BYTES // (n_library * self.BYTES_PER_SCORE))
+        lib_title_t = self.lib_title.T.tocsc()
+        lib_content_t = self.lib_content.T.tocsc()
+        shortlists: List[List[int]] = []
+        for start in range(0, len(clauses), chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            scores = (sparse.diags(w_title[rows]) @ (q_title[rows] @ lib_title_t)
+                      + sparse.diags(w_content[rows]) @ (q_content[rows] @ lib_content_t)).toarray()
+            # 前 k 名位于分区后的末尾 k 列（不再复制一份取负的得分矩阵）
+            top = np.argpartition(scores, n_library - k, axis=1)[:, n_library - k:]
+            for r, cols in enumerate(top):
+                shortlists.append([int(c) for c in cols if scores[r, c] > 0])
+        return shortlists
+
+
+class MinHashIndex:
+    """
+    正文 MinHash 签名与 LSH 分桶：
+    每段正文取长度为 MINHASH_SHINGLE 的字符 shingle，用 numpy 一次算出全部
+    h(x) = (a·x + b) mod p 的最小值作为签名；两段正文签名逐位相等的比例即 Jaccard 估计，
+    代价与正文长度无关。签名按 MINHASH_BANDS 分桶，每桶排序后二分查找同桶条目作为候选。
+    模式（minhash / auto）与参数在构建时固定，随索引一起进入缓存与工作进程。
+    """
+    PRIME = (1 << 31) - 1
+    SEED = 20250101
+    
+    def __init__(self, texts: Sequence[str], config=ClauseConfig, mode: Optional[str] = None):
+        import numpy as np
+        if config.MINHASH_PERMUTATIONS % config.MINHASH_BANDS:
+            raise ValueError("MINHASH_BANDS 须整除 MINHASH_PERMUTATIONS")
+        self.mode = mode or config.CONTENT_SIMILARITY
+        self.min_chars = config.MINHASH_MIN_CHARS
+        self.shingle = config.MINHASH_SHINGLE
+        self.bands = config.MINHASH_BANDS
+        rng = random.Random(self.SEED)
+        perms = config.MINHASH_PERMUTATIONS
+        self._a = np.array([rng.randrange(1, self.PRIME) for _ in range(perms)], dtype=np.uint64)
+        self._b = np.array([rng.randrange(0, self.PRIME) for _ in range(perms)], dtype=np.uint64)
+        
+        self.signatures = np.zeros((len(texts), perms), dtype=np.uint32)
+        self.has_signature = np.zeros(len(texts), dtype=bool)
+        for i, text in enumerate(texts):
+            sig = self.signature(text) if self.applies(text) else None
+            if sig is not None:
+                self.signatures[i] = sig
+                self.has_signature[i] = True
+        
+        ids = np.flatnonzero(self.has_signature).astype(np.int32)
+        keys = self._band_keys(self.signatures[ids])
+        order = np.argsort(keys, axis=0, kind="stable")
+        self.band_keys = [keys[order[:, b], b] for b in range(self.bands)]
+        self.band_ids = [ids[order[:, b]] for b in range(self.bands)]
+    
+    def applies(self, text: str) -> bool:
+        """该正文是否使用 MinHash（auto 模式下只处理长正文）"""
+        return bool(text) and (self.mode == "minhash" or len(text) >= self.min_chars)
+    
+    def signature(self, text: str):
+        """正文的 MinHash 签名（uint32 数组）；空文本返回 None"""
+        import numpy as np
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        if not len(codes):
+            return None
+        k = min(self.shingle, len(codes))
+        n = len(codes) - k + 1
+        shingles = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            shingles = shingles * np.uint64(1000003) + codes[j:j + n]
+        shingles = np.unique((shingles ^ (shingles >> np.uint64(29))) & np.uint64(0xFFFFFFFF))
+        hashed = (shingles[:, None] * self._a + self._b) % np.uint64(self.PRIME)
+        return hashed.min(axis=0).astype(np.uint32)
+    
+    def _band_keys(self, signatures):
+        """每个签名每个分桶的 64 位桶键，形状 (n, bands)"""
+        import numpy as np
+        rows = signatures.reshape(len(signatures), self.bands, len(self._a) // self.bands).astype(np.uint64)
+        keys = np.zeros(rows.shape[:2], dtype=np.uint64)
+        for j in range(rows.shape[2]):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) + rows[:, :, j]
+        return keys
+    
+    def candidates(self, signature) -> Set[int]:
+        """与给定签名至少落入一个相同分桶的条目下标"""
+        import numpy as np
+        keys = self._band_keys(signature[None, :])[0]
+        found: Set[int] = set()
+        for b in range(self.bands):
+            lo = np.searchsorted(self.band_keys[b], keys[b], side="left")
+            hi = np.searchsorted(self.band_keys[b], keys[b], side="right")
+            found.update(self.band_ids[b][lo:hi].tolist())
+        return found
+    
+    def similarities(self, signature, ids: List[int]) -> List[float]:
+        """给定签名与各条目签名的 Jaccard 估计（条目须有签名）"""
+        if not ids:
+            return []
+        return (self.signatures[ids] == signature).mean(axis=1).tolist()
+
+
+# ==========================================
+# 条款库近似重复分析
+# ==========================================
+class LibraryDedup:
+    """
+    条款库近似重复聚类：
+    1. 按 clean_title 哈希分组（版本号、A/B 款、险种前缀等已被清理，变体落入同组）；
+    2. 组内以 clean_content 的 MinHash 签名估计 Jaccard，不低于阈值的两两连边（正文均为空也视为重复），
+       并查集合并为簇；
+    3. 每簇选一个代表：名称中年份最新者优先，其次库内靠前者，结果确定。
+    代表映射可存为去重索引（JSON，以条款库指纹校验），匹配时只对代表条目逐条评分。
+    """
+    FORMAT_VERSION = 1
+    _YEAR = re.compile(r"(20\d{2})")
+    
+    def __init__(self, library: LibraryIndex, threshold: Optional[float] = None):
+        if not HAS_NUMPY:
+            raise RuntimeError("条款库去重分析需要安装 numpy")
+        config = library.logic.config
+        self.library = library
+        self.threshold = config.DEDUP_CONTENT_THRESHOLD if threshold is None else threshold
+        self.minhash = MinHashIndex(library.contents_clean, config, mode="minhash")
+        
+        parent = list(range(len(library)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        groups: Dict[str, List[int]] = {}
+        for i, name_clean in enumerate(library.names_clean):
+            if name_clean:
+                groups.setdefault(name_clean, []).append(i)
+        self.similarity: Dict[Tuple[int, int], float] = {}
+        for ids in groups.values():
+            for pos, i in enumerate(ids[:-1]):
+                others = ids[pos + 1:]
+                if self.minhash.has_signature[i]:
+                    with_sig = [j for j in others if self.minhash.has_signature[j]]
+                    sims = zip(with_sig, self.minhash.similarities(self.minhash.signatures[i], with_sig))
+                else:
+                    sims = ((j, 1.0) for j in others if not self.minhash.has_signature[j])
+                for j, sim in sims:
+                    if sim >= self.threshold:
+                        self.similarity[(i, j)] = sim
+                        parent[find(j)] = find(i)
+        
+        members: Dict[int, List[int]] = {}
+        for i in range(len(library)):
+            members.setdefault(find(i), []).append(i)
+        self.clusters: List[List[int]] = sorted(
+            (ids for ids in members.values() if len(ids) > 1), key=lambda ids: (-len(ids), ids[0]))
+        self.representative = list(range(len(library)))
+        for ids in self.clusters:
+            rep = min(ids, key=lambda i: (-self._year(library.names[i]), i))
+            for i in ids:
+                self.representative[i] = rep
+    
+    @classmethod
+    def _year(cls, name: str) -> int:
+        years = cls._YEAR.findall(name)
+        return max(map(int, years)) if years else 0
+    
+    def duplicate_rows(self) -> int:
+        """去重后可不再逐条评分的条目数"""
+        return sum(len(ids) - 1 for ids in self.clusters)
+    
+    def report_rows(self) -> List[Dict]:
+        """簇报告：每簇代表在前，其余按库内顺序；内容相似度为与代表的 MinHash 估计"""
+        rows = []
+        library = self.library
+        for number, ids in enumerate(self.clusters, 1):
+            rep = self.representative[ids[0]]
+            for i in [rep] + [i for i in ids if i != rep]:
+                if i == rep:
+                    sim = 1.0
+                elif self.minhash.has_signature[i] and self.minhash.has_signature[rep]:
+                    sim = self.minhash.similarities(self.minhash.signatures[rep], [i])[0]
+                else:
+                    sim = 1.0
+                rows.append({
+                    '簇编号': number,
+                    '簇大小': len(ids),
+                    '代表条目': "✓" if i == rep else "",
+                    '条款名称': library.names[i],
+                    '产品注册号': library.regs[i],
+                    '清理后标题': library.names_clean[i],
+                    '与代表内容相似度': round(sim, 3),
+                    '库内序号': i + 1,
+                })
+        return rows
+    
+    @classmethod
+    def index_path(cls, workbook_path: str, config=ClauseConfig) -> str:
+        """去重索引默认路径：条款库工作簿旁的 <工作簿名>.dedup.json"""
+        return os.path.abspath(workbook_path) + config.DEDUP_INDEX_SUFFIX
+    
+    def save_index(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.FORMAT_VERSION,
+                "library_fingerprint": self.library.fingerprint,
+                "threshold": self.threshold,
+                "representative": self.representative,
+            }, f)
+    
+    @classmethod
+    def load_index(cls, path: str, library: LibraryIndex) -> Optional[List[int]]:
+        """读取去重索引；不存在、已损坏或与当前条款库不符（指纹不同）时返回 None"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (data.get("version") != cls.FORMAT_VERSION
+                or data.get("library_fingerprint") != library.fingerprint
+                or len(data.get("representative", ())) != len(library)):
+            return None
+        return data["representative"]
+
+
+# ==========================================
+# 并行匹配：进程池工作函数（需位于模块顶层以便 pickle）
+# ==========================================
+_process_logic = None
+_process_library: Optional[LibraryIndex] = None
+
+
+def _init_match_process(logic, library: LibraryIndex, config_values: Dict[str, object]):
+    """进程池 initializer：每个工作进程只接收一次条款库索引，并套用父进程的配置"""
+    global _process_logic, _process_library
+    for name, value in config_values.items():
+        setattr(logic.config, name, value)
+    # 由配置编译出的自动机 / 规范化引擎按新配置重建
+    logic._automata.clear()
+    _process_logic = logic
+    _process_library = library
+
+
+def _match_in_process(clause: ClauseItem, is_title_only: bool,
+                      shortlist: Optional[List[int]]) -> Tuple[MatchResult, float]:
+    start = time.perf_counter()
+    result = _process_logic.match_clause(clause, _process_library, is_title_only, shortlist)
+    return result, time.perf_counter() - start
+
+
+# ==========================================
+# 性能统计
+# ==========================================
+class PerfRecorder:
+    """
+    轻量性能统计：stage(name) 为计时上下文，累计各阶段墙钟时间；count(name, n) 累加计数；
+    clause(document, title, seconds) 记录单条匹配耗时。
+    enabled=False 时 stage 返回空上下文、其余方法直接返回，开销可忽略。
+    """
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.clauses: List[Tuple[str, str, float]] = []
+        self._start = time.perf_counter()
+    
+    def stage(self, name: str):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(name)
+    
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+    
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+    
+    def clause(self, document: str, title: str, seconds: float):
+        if self.enabled:
+            self.clauses.append((document, title, seconds))
+    
+    def as_dict(self) -> Dict:
+        return {
+            "total_seconds": round(time.perf_counter() - self._start, 6),
+            "stages": {name: round(sec, 6) for name, sec in self.stages.items()},
+            "counters": dict(self.counters),
+            "clauses": [{"document": doc, "title": title, "seconds": round(sec, 6)}
+                        for doc, title, sec in self.clauses],
+        }
+    
+    def rows(self) -> List[Dict]:
+        """“性能统计”工作表的行：阶段耗时、计数，以及按耗时降序的单条匹配耗时"""
+        rows = [{'类别': "总计", '名称': "总耗时 (秒)", '数值': round(time.perf_counter() - self._start, 4)}]
+        rows += [{'类别': "阶段耗时 (秒)", '名称': name, '数值': round(sec, 4)}
+                 for name, sec in self.stages.items()]
+        rows += [{'类别': "计数", '名称': name, '数值': n} for name, n in self.counters.items()]
+        for doc, title, sec in sorted(self.clauses, key=lambda c: -c[2]):
+            rows.append({'类别': "单条匹配 (毫秒)", '名称': title, '数值': round(sec * 1000, 3), '文档': doc})
+        return rows
+    
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
+
+
+# ==========================================
+# 报告输出
+# ==========================================
+class ReportWriter:
+    """
+    比对报告写出器：openpyxl 只写模式单遍写入，写完即保存，不再回读文件。
+    表头 / 正文样式注册为工作簿命名样式，逐行写入时按名称引用；
+    匹配度与匹配级别的着色为工作表级条件格式（几条规则覆盖整列），不逐格设置填充。
+    """
+    # 前 13 列（A-M）的列宽，其余列（备选1..k）使用 EXTRA_COLUMN_WIDTH
+    COLUMN_WIDTHS = [6, 35, 30, 45, 40, 25, 50, 10, 12, 35, 10, 10, 10]
+    EXTRA_COLUMN_WIDTH = 40
+    SCORE_COLUMN = '综合匹配度'
+    LEVEL_COLUMN = '匹配级别'
+    
+    FILL_COLORS = {
+        'green': "C6EFCE",
+        'yellow': "FFEB9C",
+        'red': "FFC7CE",
+        'blue': "CCE5FF",
+    }
+    HEADER_COLOR = "667eea"
+    # 匹配度分段（依次判断，先命中者生效）：≥0.8 绿，≥0.5 黄，>0 红
+    SCORE_BANDS = [('greaterThanOrEqual', '0.8', 'green'),
+                   ('greaterThanOrEqual', '0.5', 'yellow'),
+                   ('greaterThan', '0', 'red')]
+    # 匹配级别包含的关键字 -> 颜色
+    LEVEL_COLORS = [('精确', 'green'), ('语义', 'blue'), ('关键词', 'yellow')]
+    
+    def __init__(self, path: str, columns: List[str], creator: str = "Dachi Yijin",
+                 widths: Optional[List[int]] = None, title: str = "Sheet1"):
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import NamedStyle, PatternFill, Font, Alignment, Border, Side
+        from openpyxl.styles.fonts import DEFAULT_FONT
+        from openpyxl.utils import get_column_letter
+        
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        self._cell = WriteOnlyCell
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.wb.properties.creator = creator
+        self.ws = self.wb.create_sheet(title)
+        
+        side = Side(style='thin', color='CCCCCC')
+        border = Border(left=side, right=side, top=side, bottom=side)
+        self.wb.add_named_style(NamedStyle(
+            name="report_header",
+            font=Font(bold=True, color="FFFFFF", size=11),
+            fill=PatternFill(start_color=self.HEADER_COLOR, end_color=self.HEADER_COLOR, fill_type="solid"),
+            alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+            border=border))
+        self.wb.add_named_style(NamedStyle(
+            name="report_cell", font=DEFAULT_FONT, alignment=Alignment(wrap_text=True, vertical='top'),
+            border=border))
+        
+        widths = self.COLUMN_WIDTHS if widths is None else widths
+        for col_idx in range(1, len(self.columns) + 1):
+            width = widths[col_idx - 1] if col_idx <= len(widths) else self.EXTRA_COLUMN_WIDTH
+            self.ws.column_dimensions[get_column_letter(col_idx)].width = width
+        self.ws.freeze_panes = 'A2'
+        
+        self.ws.append([self._styled(col, "report_header") for col in self.columns])
+    
+    def _styled(self, value, style: str, ws=None):
+        cell = self._cell(ws or self.ws, value=value)
+        cell.style = style
+        return cell
+    
+    def write_row(self, row: Dict):
+        """按表头顺序写入一行（dict 中缺少的列写空）"""
+        self.ws.append([self._styled(row.get(col), "report_cell") for col in self.columns])
+        self.rows += 1
+    
+    PERF_COLUMNS = ['类别', '名称', '数值', '文档']
+    PERF_WIDTHS = [18, 60, 14, 30]
+    
+    PERF_SHEET_NOTE = "本表在保存工作簿之前生成，总耗时与各阶段均不含本工作簿的保存耗时（见日志或 --perf-json）"
+    
+    def add_perf_sheet(self, perf: PerfRecorder):
+        """追加“性能统计”工作表（在 save 之前调用），首行注明不含本工作簿的保存耗时"""
+        from openpyxl.utils import get_column_letter
+        ws = self.wb.create_sheet("性能统计")
+        for col_idx, width in enumerate(self.PERF_WIDTHS, 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+        ws.freeze_panes = 'A2'
+        ws.append([self._styled(col, "report_header", ws) for col in self.PERF_COLUMNS])
+        for row in [{'类别': "说明", '名称': self.PERF_SHEET_NOTE}] + perf.rows():
+            ws.append([self._styled(row.get(col), "report_cell", ws) for col in self.PERF_COLUMNS])
+    
+    def _add_conditional_formats(self):
+        """为匹配度 / 匹配级别两列各添加一组条件格式规则，范围为全部数据行"""
+        from openpyxl.formatting.rule import CellIsRule, Rule
+        from openpyxl.styles import PatternFill
+        from openpyxl.styles.differential import DifferentialStyle
+        from openpyxl.utils import get_column_letter
+        
+        if not self.rows:
+            return
+        fills = {name: PatternFill(start_color=color, end_color=color, fill_type="solid")
+                 for name, color in self.FILL_COLORS.items()}
+        last_row = self.rows + 1
+        
+        if self.SCORE_COLUMN in self.columns:
+            col = get_column_letter(self.columns.index(self.SCORE_COLUMN) + 1)
+            for operator, value, color in self.SCORE_BANDS:
+                self.ws.conditional_formatting.add(
+                    f"{col}2:{col}{last_row}",
+                    CellIsRule(operator=operator, formula=[value], fill=fills[color], stopIfTrue=True))
+        
+        if self.LEVEL_COLUMN in self.columns:
+            col = get_column_letter(self.columns.index(self.LEVEL_COLUMN) + 1)
+            for text, color in self.LEVEL_COLORS:
+                rule = Rule(type="containsText", operator="containsText", text=text,
+                            dxf=DifferentialStyle(fill=fills[color]), stopIfTrue=True)
+                rule.formula = [f'NOT(ISERROR(SEARCH("{text}",{col}2)))']
+                self.ws.conditional_formatting.add(f"{col}2:{col}{last_row}", rule)
+    
+    def save(self):
+        self._add_conditional_formats()
+        self.wb.save(self.path)
+
+
+# ==========================================
+# 比对流程：解析 -> 条款库 -> 预翻译 -> 匹配 -> 报告
+# ==========================================
+class ClauseMatchPipeline:
+    """
+    完整比对流程（不依赖 Qt）。
+    log(msg, level) 与 progress(done, total) 为回调：图形界面转发为 Qt 信号，命令行输出为 JSON。
+    perf_stats 开启时记录各阶段耗时与计数，写入报告的“性能统计”工作表；
+    perf_json 给出路径时另写一份 JSON（并隐含开启统计）。
+    """
+    STAT_KEYS = ('exact', 'semantic', 'keyword', 'fuzzy', 'none')
+    PERF_SHEET_IN_REPORT = True   # 批量模式改为写入汇总工作簿
+    
+    def __init__(self, doc_path: str, excel_path: str, output_path: str,
+                 batch_tfidf: Optional[bool] = None, processes: Optional[int] = None,
+                 log: Optional[Callable[[str, str], None]] = None,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 perf_stats: Optional[bool] = None, perf_json: Optional[str] = None):
+        self.doc_path = doc_path
+        self.excel_path = excel_path
+        self.output_path = output_path
+        self.batch_tfidf = ClauseConfig.BATCH_TFIDF if batch_tfidf is None else batch_tfidf
+        self.processes = ClauseConfig.MATCH_PROCESSES if processes is None else processes
+        self.log = log or (lambda msg, level: None)
+        self.progress = progress or (lambda done, total: None)
+        self._tfidf: Optional[BatchTfidfMatcher] = None
+        self.perf_json = perf_json
+        enabled = ClauseConfig.PERF_STATS if perf_stats is None else perf_stats
+        self.perf = PerfRecorder(enabled or bool(perf_json))
+    
+    def run(self) -> Dict[str, int]:
+        """执行比对并写出报告，返回各匹配级别的条款数"""
+        self._log_translator_status()
+        with self.perf.stage("加载条款库"):
+            library = self.load_library()
+        self.log(f"📚 加载条款库 {len(library)} 条", "info")
+        
+        stats = self.match_document(self.doc_path, self.output_path, library)
+        self._finish_perf()
+        self.log("🎉 完成！已生成报告", "success")
+        return stats
+    
+    def match_document(self, doc_path: str, output_path: str, library: LibraryIndex,
+                       pool: Optional[ProcessPoolExecutor] = None,
+                       translation_stage: Optional[TranslationStage] = None) -> Dict[str, int]:
+        """
+        单份文档：解析 -> 预翻译 -> 召回 -> 匹配 -> 写出报告，返回各匹配级别的条款数。
+        translation_stage 为调用方持有、跨多份文档复用的预翻译阶段（见 translate_clauses）。
+        """
+        logic = ClauseMatcherLogic
+        perf = self.perf
+        # 条款库可能取自缓存（不经 LibraryIndex 构建），每份文档开始前检查一次配置是否被原地改动
+        logic.refresh_compiled()
+        
+        self.log("⏳ 正在解析文档...", "info")
+        with perf.stage("解析文档"):
+            clauses, is_title_only = logic.parse_docx(doc_path)
+        mode_str = "纯标题模式" if is_title_only else "完整内容模式"
+        self.log(f"📖 [{mode_str}] 提取到 {len(clauses)} 条", "success")
+        perf.count("条款数", len(clauses))
+        
+        with perf.stage("预翻译"):
+            translations = self.translate_clauses(clauses, translation_stage)
+        use_tfidf = self.batch_tfidf and HAS_SCIPY
+        
+        # 匹配结果缓存：未改动的条款直接复用，只对其余条款召回与匹配
+        match_results: List[Optional[MatchResult]] = [None] * len(clauses)
+        cache = logic.match_cache() if logic.config.MATCH_CACHE else None
+        keys: List[str] = []
+        if cache is not None:
+            with perf.stage("结果缓存查询"):
+                config_fp = logic.config.fingerprint()
+                mode = "tfidf" if use_tfidf else "index"
+                keys = [MatchResultCache.clause_key(c, is_title_only, library.fingerprint, config_fp, mode)
+                        for c in clauses]
+                hits = cache.get_many(keys)
+                match_results = [hits.get(key) for key in keys]
+        reused = [r is not None for r in match_results]
+        pending = [i for i, hit in enumerate(reused) if not hit]
+        pending_clauses = [clauses[i] for i in pending]
+        perf.count("匹配结果复用", len(clauses) - len(pending))
+        perf.count("匹配结果重新计算", len(pending))
+        if any(reused):
+            self.log(f"♻️ 复用 {sum(reused)} 条未改动条款的历史结果，重新计算 {len(pending)} 条", "info")
+        
+        # 批量 TF-IDF 召回（同一条款库只建一次矩阵）
+        shortlists = [None] * len(pending_clauses)
+        if self.batch_tfidf and pending_clauses:
+            if use_tfidf:
+                self.log("🧮 批量 TF-IDF 召回候选...", "info")
+                with perf.stage("TF-IDF 召回"):
+                    if self._tfidf is None or self._tfidf.library is not library:
+                        self._tfidf = BatchTfidfMatcher(library)
+                    shortlists = self._tfidf.shortlist(pending_clauses, is_title_only)
+            else:
+                self.log("⚠️ 未检测到 scipy，改用 n-gram 索引逐条召回", "warning")
+        
+        self.log("🧠 开始智能匹配（多级策略）...", "info")
+        report = ReportWriter(output_path, self.report_columns())
+        
+        stats = dict.fromkeys(self.STAT_KEYS, 0)
+        
+        processes = self.resolved_processes()
+        if pool is None and processes > 1 and len(pending) >= logic.config.MATCH_PARALLEL_MIN_CLAUSES:
+            self.log(f"⚙️ 并行匹配：{processes} 个进程", "info")
+        clause_times = [] if perf.enabled else None
+        with perf.stage("条款匹配"):
+            computed = logic.match_many(
+                pending_clauses, library, is_title_only, shortlists, processes,
+                self._on_match_progress, pool, clause_times)
+        for i, result in zip(pending, computed):
+            match_results[i] = result
+        if perf.enabled:
+            document = os.path.basename(doc_path)
+            for clause, seconds in zip(pending_clauses, clause_times):
+                perf.clause(document, clause.title, seconds)
+            perf.count("条款库比较条数", sum(r.candidates_scored for r in computed))
+        if cache is not None and pending:
+            with perf.stage("结果缓存写入"):
+                cache.put_many([(keys[i], match_results[i]) for i in pending])
+        
+        with perf.stage("写出报告"):
+            for idx, (clause, match_result) in enumerate(zip(clauses, match_results), 1):
+                original_title, translated_title, was_translated = translations[idx - 1]
+            
+                # 统计
+                if match_result.match_level == MatchLevel.EXACT:
+                    stats['exact'] += 1
+                elif match_result.match_level == MatchLevel.SEMANTIC:
+                    stats['semantic'] += 1
+                elif match_result.match_level == MatchLevel.KEYWORD:
+                    stats['keyword'] += 1
+                elif match_result.match_level == MatchLevel.FUZZY:
+                    stats['fuzzy'] += 1
+                else:
+                    stats['none'] += 1
+
+                row = {
+                    '序号': idx,
+                    '客户条款(原)': original_title,
+                    '客户条款(译)': translated_title if was_translated else "",
+                    '客户原始内容': clause.content[:500] if clause.content else "", 
+                    '匹配条款库名称': match_result.matched_name or "无匹配",
+                    '产品注册号': match_result.matched_reg,
+                    '匹配条款库内容': match_result.matched_content[:500] if match_result.matched_content else "",
+                    '综合匹配度': round(match_result.score, 3),
+                    '匹配级别': match_result.match_level.value,
+                    '保障差异提示': match_result.diff_analysis,
+                    '标题相似度': round(match_result.title_score, 3),
+                    '内容相似度': round(match_result.content_score, 3),
+                    '结果来源': "复用" if reused[idx - 1] else "重新计算",
+                }
+                for i in range(logic.config.MATCH_ALTERNATIVES):
+                    alt = match_result.alternatives[i] if i < len(match_result.alternatives) else None
+                    row[f'备选{i + 1}'] = (
+                        f"{alt.name} ({alt.score:.3f} {alt.match_level.value})" if alt else "")
+                report.write_row(row)
+        
+        # 保存结果（性能统计工作表须在保存前写入，不含保存耗时；保存耗时记入 JSON 与日志）
+        if perf.enabled and self.PERF_SHEET_IN_REPORT:
+            report.add_perf_sheet(perf)
+        with perf.stage("保存报告"):
+            report.save()
+        
+        # 输出统计
+        self.log("📊 匹配统计:", "info")
+        self.log(f"   精确匹配: {stats['exact']}", "success")
+        self.log(f"   语义匹配: {stats['semantic']}", "success")
+        self.log(f"   关键词匹配: {stats['keyword']}", "info")
+        self.log(f"   模糊匹配: {stats['fuzzy']}", "warning")
+        self.log(f"   无匹配: {stats['none']}", "error")
+        return stats
+    
+    def _finish_perf(self):
+        """统计结束：输出阶段耗时日志，按需写出 JSON"""
+        if not self.perf.enabled:
+            return
+        stages = "，".join(f"{name} {sec:.2f}s" for name, sec in self.perf.stages.items())
+        self.log(f"⏱️ 阶段耗时: {stages}", "info")
+        if self.perf_json:
+            self.perf.write_json(self.perf_json)
+            self.log(f"⏱️ 性能统计已写入 {self.perf_json}", "info")
+    
+    def _log_translator_status(self):
+        if ClauseMatcherLogic.translator is None:
+            self.log("⚠️ 未检测到 deep_translator，仅使用内置术语表", "warning")
+        else:
+            self.log("✓ 已启用在线翻译支持", "success")
+    
+    def resolved_processes(self) -> int:
+        """实际进程数：-1 为 CPU 核数"""
+        return (os.cpu_count() or 1) if self.processes < 0 else self.processes
+
+    def load_library(self) -> LibraryIndex:
+        """读取条款库并构建索引；条款库旁有匹配的去重索引时只在各簇代表条目中检索"""
+        index = self.read_library()
+        config = ClauseMatcherLogic.config
+        if config.DEDUP_INDEX:
+            path = LibraryDedup.index_path(self.excel_path, config)
+            if os.path.exists(path):
+                representative = LibraryDedup.load_index(path, index)
+                if representative is None:
+                    self.log("⚠️ 去重索引与当前条款库不符，已忽略（请重新生成）", "warning")
+                else:
+                    index.use_representatives(representative)
+                    self.log(f"🧩 已启用去重索引：{len(index)} 条归并为 {len(set(representative))} 个代表条目", "info")
+        return index
+    
+    def read_library(self) -> LibraryIndex:
+        """读取条款库 Excel，识别列名并构建索引；工作簿未变化时直接读取缓存"""
+        config = ClauseMatcherLogic.config
+        cache = LibraryCache(self.excel_path, config) if config.LIBRARY_CACHE else None
+        if cache is not None:
+            index = cache.load()
+            self.perf.count("条款库缓存命中", int(index is not None))
+            if index is not None:
+                self.log("⚡ 条款库未变化，已加载缓存索引", "info")
+                return index
+        
+        import pandas as pd
+        lib_df = pd.read_excel(self.excel_path, header=1)
+        lib_df.columns = [str(c).strip() for c in lib_df.columns]
+        
+        # 识别列名
+        name_col = None
+        content_col = None
+        reg_col = None
+        for col in lib_df.columns:
+            if '条款名称' in col or '名称' in col:
+                name_col = col
+            elif '条款内容' in col or '内容' in col:
+                content_col = col
+            elif '注册号' in col or '产品' in col:
+                reg_col = col
+        
+        if not name_col:
+            name_col = lib_df.columns[0]
+        if not content_col and len(lib_df.columns) > 2:
+            content_col = lib_df.columns[2]
+        if not reg_col and len(lib_df.columns) > 1:
+            reg_col = lib_df.columns[1]
+            
+        # 标准化数据（按列处理：空值 -> ''，其余转字符串）
+        def text_column(col) -> 'pd.Series':
+            if not col:
+                return pd.Series('', index=lib_df.index, dtype=object)
+            values = lib_df[col]
+            return values.where(values.notna(), '').astype(str)
+        
+        normalized = pd.DataFrame({
+            '条款名称': text_column(name_col),
+            '条款内容': text_column(content_col),
+            '产品注册号': text_column(reg_col),
+        })
+        normalized = normalized[normalized['条款名称'].str.strip() != '']
+        index = LibraryIndex.from_columns(
+            normalized['条款名称'].tolist(), normalized['条款内容'].tolist(),
+            normalized['产品注册号'].tolist(), ClauseMatcherLogic)
+        
+        if cache is not None and not cache.save(index):
+            self.log("⚠️ 条款库缓存写入失败（目录不可写？），下次仍将重新解析", "warning")
+        return index
+
+    def translation_stage(self) -> TranslationStage:
+        """按当前配置创建预翻译阶段（含独立的熔断器）"""
+        logic = ClauseMatcherLogic
+        config = logic.config
+        return TranslationStage(
+            logic.translator, logic.translation_cache(), config.TRANSLATE_TARGET,
+            config.TRANSLATE_MAX_WORKERS, config.TRANSLATE_RATE_LIMIT,
+            config.TRANSLATE_RETRIES, config.TRANSLATE_RETRY_BACKOFF,
+            config.TRANSLATE_CALL_TIMEOUT, config.TRANSLATE_TIME_BUDGET,
+            CircuitBreaker(config.TRANSLATE_BREAKER_THRESHOLD, config.TRANSLATE_BREAKER_COOLDOWN))
+
+    def translate_clauses(self, clauses: List[ClauseItem],
+                          stage: Optional[TranslationStage] = None) -> List[Tuple[str, str, bool]]:
+        """
+        预翻译并就地替换英文条款的标题与内容。
+        stage 为跨文档复用的预翻译阶段：其熔断后的仅术语表模式对之后的文档继续有效；
+        为 None 时新建一个。返回每条的 (原标题, 译后标题, 是否翻译)。
+        """
+        logic = ClauseMatcherLogic
+        
+        # 预翻译：去重后并发翻译所有待译文本
+        translated_texts: Dict[str, str] = {}
+        pending = logic.pending_translations(clauses)
+        if pending:
+            # 未安装翻译后端时仍查翻译缓存，已缓存的文本照常翻译
+            self.log(f"🌐 预翻译 {len(set(pending))} 条文本..."
+                     + ("" if logic.translator is not None else "（仅查翻译缓存）"), "info")
+            if stage is None:
+                stage = self.translation_stage()
+            cache = stage.cache
+            cache_base = (cache.hits, cache.misses) if cache is not None else (0, 0)
+            calls_base, failed_base = stage.calls, len(stage.failed)
+            translated_texts = stage.run(pending, self._on_stage_progress)
+            failed = len(stage.failed) - failed_base
+            self.perf.count("翻译请求数", stage.calls - calls_base)
+            if cache is not None:
+                self.perf.count("翻译缓存命中", cache.hits - cache_base[0])
+                self.perf.count("翻译缓存未命中", cache.misses - cache_base[1])
+                self.log(
+                    f"🗂️ 翻译缓存: 命中 {cache.hits - cache_base[0]} / 未命中 {cache.misses - cache_base[1]}", "info")
+            if stage.glossary_only:
+                reason = "连续请求失败" if stage.breaker.is_open else "超出翻译时长预算"
+                self.log(
+                    f"⚠️ 翻译服务不可用（{reason}），已切换为仅术语表模式，"
+                    f"{failed} 条文本未翻译", "warning")
+            elif failed:
+                self.log(f"⚠️ {failed} 条文本翻译失败，保留原文", "warning")
+        
+        translations = []
+        for clause in clauses:
+            original_title = clause.title
+            translated_title, was_translated = logic.translate_title(clause.title, translated_texts)
+            
+            if was_translated:
+                clause.title = translated_title
+                clause.original_title = original_title
+                if clause.content and logic.is_english(clause.content):
+                    clause.content = translated_texts.get(clause.content, clause.content)
+            translations.append((original_title, translated_title, was_translated))
+        return translations
+
+    def _on_stage_progress(self, done: int, total: int):
+        """预翻译 / 匹配阶段的进度"""
+        self.progress(done, total)
+    
+    def _on_match_progress(self, done: int, total: int):
+        self._on_stage_progress(done, total)
+        if done % 10 == 0:
+            self.log(f"   已处理 {done}/{total}...", "info")
+
+    @staticmethod
+    def report_columns() -> List[str]:
+        """报告表头：固定列 + 备选1..k"""
+        return ['序号', '客户条款(原)', '客户条款(译)', '客户原始内容', '匹配条款库名称', '产品注册号',
+                '匹配条款库内容', '综合匹配度', '匹配级别', '保障差异提示', '标题相似度', '内容相似度',
+                '结果来源'] + [f'备选{i + 1}' for i in range(ClauseMatcherLogic.config.MATCH_ALTERNATIVES)]
+
+
+class BatchMatchPipeline(ClauseMatchPipeline):
+    """
+    多文档批量比对：条款库只加载、索引一次；并行时进程池也只启动一次，
+    每个工作进程只接收一次索引，全部文档共用。预翻译阶段（含熔断器与总时长预算）也只建一次，
+    翻译服务不可用时整批切换为仅术语表模式，后续文档不再逐份等待请求超时。
+    每份文档写出各自的报告（与汇总工作簿同目录），最后写出汇总工作簿；
+    单份文档失败只记入汇总，不影响其余文档。progress(done, total) 以文档为单位。
+    """
+    REPORT_SUFFIX = "_条款比对报告.xlsx"
+    SUMMARY_COLUMNS = ['序号', '客户文档', '条款数', '精确匹配', '语义匹配', '关键词匹配',
+                       '模糊匹配', '无匹配', '匹配率', '报告文件', '状态']
+    SUMMARY_WIDTHS = [6, 40, 8, 10, 10, 12, 10, 8, 10, 60, 30]
+    PERF_SHEET_IN_REPORT = False   # 全部文档的统计累计后写入汇总工作簿
+    
+    def __init__(self, doc_paths: List[str], excel_path: str, summary_path: str,
+                 batch_tfidf: Optional[bool] = None, processes: Optional[int] = None,
+                 log: Optional[Callable[[str, str], None]] = None,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 perf_stats: Optional[bool] = None, perf_json: Optional[str] = None):
+        super().__init__("", excel_path, summary_path, batch_tfidf, processes, log, progress,
+                         perf_stats, perf_json)
+        self.doc_paths = list(doc_paths)
+        self.output_dir = os.path.dirname(os.path.abspath(summary_path))
+    
+    @staticmethod
+    def collect_documents(folder: str) -> List[str]:
+        """文件夹下的 .docx（不递归，跳过 Word 临时文件 ~$*.docx），按文件名排序"""
+        return sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith(".docx") and not name.startswith("~$"))
+    
+    def report_paths(self) -> List[str]:
+        """每份文档的报告路径：<汇总目录>/<文档名>_条款比对报告.xlsx，重名时追加序号"""
+        paths, used = [], set()
+        for idx, doc_path in enumerate(self.doc_paths, 1):
+            stem = os.path.splitext(os.path.basename(doc_path))[0]
+            path = os.path.join(self.output_dir, stem + self.REPORT_SUFFIX)
+            if path in used:
+                path = os.path.join(self.output_dir, f"{stem}_{idx}{self.REPORT_SUFFIX}")
+            used.add(path)
+            paths.append(path)
+        return paths
+    
+    def run(self) -> Dict[str, int]:
+        """比对全部文档并写出汇总，返回全部文档合计的各匹配级别条款数"""
+        self._log_translator_status()
+        with self.perf.stage("加载条款库"):
+            library = self.load_library()
+        self.log(f"📚 加载条款库 {len(library)} 条，待比对文档 {len(self.doc_paths)} 份", "info")
+        
+        totals = dict.fromkeys(self.STAT_KEYS, 0)
+        rows = []
+        stage = self.translation_stage()
+        processes = self.resolved_processes()
+        pool = None
+        if processes > 1:
+            self.log(f"⚙️ 并行匹配：{processes} 个进程（全部文档共用）", "info")
+            pool = ClauseMatcherLogic.match_pool(library, processes)
+        try:
+            for idx, (doc_path, report_path) in enumerate(zip(self.doc_paths, self.report_paths()), 1):
+                name = os.path.basename(doc_path)
+                self.log(f"📄 [{idx}/{len(self.doc_paths)}] {name}", "info")
+                row = {'序号': idx, '客户文档': name}
+                try:
+                    stats = self.match_document(doc_path, report_path, library, pool, stage)
+                except Exception as e:
+                    self.log(f"❌ {name}: {str(e)}", "error")
+                    row['状态'] = f"失败: {str(e)}"
+                else:
+                    for key in self.STAT_KEYS:
+                        totals[key] += stats[key]
+                    row.update(self._summary_counts(stats))
+                    row['报告文件'] = report_path
+                    row['状态'] = "成功"
+                rows.append(row)
+                self.progress(idx, len(self.doc_paths))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        summary = ReportWriter(self.output_path, self.SUMMARY_COLUMNS,
+                               widths=self.SUMMARY_WIDTHS, title="汇总")
+        for row in rows:
+            summary.write_row(row)
+        summary.write_row({'客户文档': "合计", **self._summary_counts(totals)})
+        if self.perf.enabled:
+            summary.add_perf_sheet(self.perf)
+        with self.perf.stage("保存报告"):
+            summary.save()
+        self._finish_perf()
+        
+        failed = sum(1 for row in rows if row['状态'] != "成功")
+        self.log(f"🎉 完成！{len(rows) - failed} 份成功，{failed} 份失败，已生成汇总", 
+                 "success" if not failed else "warning")
+        return totals
+    
+    @staticmethod
+    def _summary_counts(stats: Dict[str, int]) -> Dict:
+        total = sum(stats.values())
+        return {
+            '条款数': total,
+            '精确匹配': stats['exact'],
+            '语义匹配': stats['semantic'],
+            '关键词匹配': stats['keyword'],
+            '模糊匹配': stats['fuzzy'],
+            '无匹配': stats['none'],
+            '匹配率': f"{(total - stats['none']) / total:.1%}" if total else "",
+        }
+    
+    def _on_stage_progress(self, done: int, total: int):
+        """进度条以文档为单位，单份文档内部的阶段进度不上报"""
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+条款库近似重复分析（命令行）
+- 按清理后标题哈希分组，组内用正文 MinHash 估计相似度，把 2023/2024/2025 版、A/B 款等近似重复行聚为簇
+- 写出簇报告（每簇代表条目在前）；--write-index 时在条款库旁写出去重索引 <条款库>.dedup.json，
+  比对时启用 ClauseConfig.DEDUP_INDEX（命令行 --dedup-index）后模糊候选只取各簇代表条目，条款库变化后索引自动失效
+- 进度与摘要以 JSON 行输出，格式同 clause_diff_cli.py
+
+用法:
+    python clause_library_dedup.py 条款库.xlsx 去重报告.xlsx [--threshold 0.9] [--write-index]
+"""
+
+import sys
+import argparse
+import traceback
+
+from clause_diff_cli import emit
+from clause_diff_core import ClauseMatcherLogic, ClauseMatchPipeline, LibraryDedup, ReportWriter
+
+REPORT_COLUMNS = ['簇编号', '簇大小', '代表条目', '条款名称', '产品注册号', '清理后标题',
+                  '与代表内容相似度', '库内序号']
+REPORT_WIDTHS = [8, 8, 10, 50, 40, 25, 16, 10]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="条款库近似重复分析")
+    parser.add_argument("library", help="标准条款库 Excel (.xlsx)")
+    parser.add_argument("output", help="簇报告保存路径 (.xlsx)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="正文相似度阈值（默认取 ClauseConfig.DEDUP_CONTENT_THRESHOLD）")
+    parser.add_argument("--write-index", action="store_true", help="在条款库旁写出去重索引，供比对时使用")
+    args = parser.parse_args(argv)
+
+    config = ClauseMatcherLogic.config
+    log = lambda msg, level: emit("log", level=level, message=msg)
+    try:
+        # 分析的是完整条款库，不套用已有的去重索引
+        library = ClauseMatchPipeline("", args.library, args.output, log=log).read_library()
+        log(f"📚 加载条款库 {len(library)} 条", "info")
+        dedup = LibraryDedup(library, args.threshold)
+
+        report = ReportWriter(args.output, REPORT_COLUMNS, widths=REPORT_WIDTHS, title="近似重复簇")
+        for row in dedup.report_rows():
+            report.write_row(row)
+        report.save()
+        log(f"🧩 {len(dedup.clusters)} 个近似重复簇，可少评分 {dedup.duplicate_rows()} 条", "success")
+
+        index_path = None
+        if args.write_index:
+            index_path = LibraryDedup.index_path(args.library, config)
+            dedup.save_index(index_path)
+            log(f"💾 去重索引已写入 {index_path}", "success")
+    except Exception as e:
+        emit("error", message=str(e), traceback=traceback.format_exc())
+        return 1
+
+    emit("summary", output=args.output, index=index_path, rows=len(library),
+         clusters=len(dedup.clusters), duplicates=dedup.duplicate_rows(),
+         representatives=len(library) - dedup.duplicate_rows())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
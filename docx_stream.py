@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+流式 .docx 段落读取
+- 直接打开 docx 压缩包，用 iterparse 逐段解析主文档 XML，不构建 python-docx 对象模型
+- 段落文本规则与 python-docx 的 Paragraph.text 一致（w:t / w:tab / w:br / w:cr ...）
+- 已输出的段落及正文一级元素随即清理，内存占用不随文档长度增长
+- 供 clause_diff_core.py 与 word_extractor_gui_v7_1.py 共用，只依赖标准库
+"""
+
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from typing import Iterator
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = _W + "body"
+_P = _W + "p"
+_R = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+_TC = _W + "tc"
+_BR_TYPE = _W + "type"
+
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_OFFICE_DOCUMENT = "/officeDocument"
+
+# 段内元素 -> 文本；w:br 单独处理（只有换行型分隔符输出 "\n"）
+_RUN_CONTENT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_T = _W + "t"
+_BR = _W + "br"
+
+
+def _main_document_part(zf: zipfile.ZipFile) -> str:
+    """从 _rels/.rels 中找到主文档部件名，通常为 word/document.xml"""
+    try:
+        rels = ET.fromstring(zf.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(_REL):
+        if rel.get("Type", "").endswith(_OFFICE_DOCUMENT):
+            return posixpath.normpath(rel.get("Target", "").lstrip("/"))
+    return "word/document.xml"
+
+
+def paragraph_text(p: ET.Element) -> str:
+    """段落文本：仅取 w:p 直接子级的 w:r 与 w:hyperlink 下的 w:r，同 python-docx"""
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            runs = (child,)
+        elif child.tag == _HYPERLINK:
+            runs = child.iterfind(_R)
+        else:
+            continue
+        for run in runs:
+            for e in run:
+                tag = e.tag
+                if tag == _T:
+                    parts.append(e.text or "")
+                elif tag == _BR:
+                    if e.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                        parts.append("\n")
+                elif tag in _RUN_CONTENT:
+                    parts.append(_RUN_CONTENT[tag])
+    return "".join(parts)
+
+
+def iter_docx_paragraphs(path, include_tables: bool = False) -> Iterator[str]:
+    """
+    按文档顺序逐段输出段落文本（未 strip）。
+    include_tables=False 时只输出正文一级段落，与 python-docx 的 Document.paragraphs 相同；
+    为 True 时另输出表格单元格（含嵌套表格）中的段落。
+    """
+    with zipfile.ZipFile(path) as zf:
+        with zf.open(_main_document_part(zf)) as fp:
+            stack = []
+            for event, elem in ET.iterparse(fp, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                parent = stack[-1] if stack else None
+                if parent is None:
+                    continue
+                if elem.tag == _P and (parent.tag == _BODY or (include_tables and parent.tag == _TC)):
+                    yield paragraph_text(elem)
+                    elem.clear()
+                if parent.tag == _BODY:
+                    # 正文一级元素（段落 / 表格 / 分节符）处理完即从树上摘除
+                    parent.remove(elem)
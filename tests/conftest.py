@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""测试公共夹具：样本条款库与客户文档（仓库自带），辅助函数见 benchmarks/common.py"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import SAMPLE_DOCUMENTS, load_library, offline, sample_path  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def core():
+    """匹配逻辑所在模块；整个测试会话不读写缓存、不调用在线翻译"""
+    import clause_diff_core as core
+    offline()
+    return core
+
+
+@pytest.fixture(scope="session")
+def library(core):
+    """clause_library.xlsx 构建的 LibraryIndex"""
+    return load_library()
+
+
+@pytest.fixture(scope="session")
+def documents(core):
+    """文档名 -> (条款列表, 是否纯标题)"""
+    return {doc: core.ClauseMatcherLogic.parse_docx(sample_path(doc)) for doc in SAMPLE_DOCUMENTS}
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+配置摘要：ClauseConfig.fingerprint() 只随影响结果的配置项（FINGERPRINT_KEYS）变化。
+其余配置项（并发、超时、缓存路径与容量、性能统计等）改动后摘要不变；映射字典原地改动（条数不变）同样改变摘要。
+"""
+
+import pytest
+
+
+def changed(value):
+    """与 value 同类型的另一个值"""
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value + 1
+    if isinstance(value, str):
+        return value + "_"
+    if isinstance(value, tuple):
+        return value + (value[-1] if value else 1,)
+    if isinstance(value, list):
+        return value + ["_"]
+    if isinstance(value, dict):
+        return {**value, "_": next(iter(value.values()))}
+    raise TypeError(f"无法改动 {type(value).__name__} 类型的配置项")
+
+
+def test_keys_are_settings(core):
+    snapshot = core.ClauseConfig.snapshot()
+    assert [name for name in core.ClauseConfig.FINGERPRINT_KEYS if name not in snapshot] == []
+
+
+def test_only_whitelisted_settings_change_fingerprint(core, monkeypatch):
+    config = core.ClauseConfig
+    base = config.fingerprint()
+    wrong = []
+    for name, value in config.snapshot().items():
+        if name == "FINGERPRINT_KEYS":
+            continue
+        with monkeypatch.context() as m:
+            m.setattr(config, name, changed(value))
+            if (config.fingerprint() != base) != (name in config.FINGERPRINT_KEYS):
+                wrong.append(name)
+    assert wrong == []
+    assert config.fingerprint() == base
+
+
+@pytest.mark.parametrize("name", [
+    "CLIENT_EN_CN_MAP", "SEMANTIC_ALIAS_MAP", "KEYWORD_EXTRACT_MAP", "EXACT_CLAUSE_MAP"])
+def test_in_place_mapping_edit_changes_fingerprint(core, monkeypatch, name):
+    mapping = getattr(core.ClauseConfig, name)
+    assert name in core.ClauseConfig.FINGERPRINT_KEYS
+    base = core.ClauseConfig.fingerprint()
+    key = next(iter(mapping))
+    monkeypatch.setitem(mapping, key, changed(mapping[key]))
+    assert core.ClauseConfig.fingerprint() != base
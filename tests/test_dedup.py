@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""去重索引：精确命中保持客户写明的条目，只有模糊候选折叠为簇代表条目"""
+
+import pytest
+
+CONTENT = "经双方同意，本保险扩展承保被保险人的雇员因恐怖活动遭受的人身伤亡，赔偿限额以保险单载明为准。"
+
+
+@pytest.fixture
+def library(core):
+    rows = [{'条款名称': f"雇主责任险附加恐怖活动责任条款（{year}版）", '条款内容': CONTENT, '产品注册号': f"REG-{year}"}
+            for year in (2024, 2025)]
+    index = core.LibraryIndex(rows, core.ClauseMatcherLogic)
+    index.use_representatives([1, 1])
+    return index
+
+
+def test_exact_title_keeps_named_version(core, library):
+    clause = core.ClauseItem("雇主责任险附加恐怖活动责任条款（2024版）", CONTENT)
+    result, = core.ClauseMatcherLogic.match_many([clause], library, False)
+    assert (result.matched_reg, result.match_level) == ("REG-2024", core.MatchLevel.EXACT)
+
+
+def test_fuzzy_candidates_fold_to_representative(core, library):
+    clause = core.ClauseItem("雇主责任附加恐怖活动条款", CONTENT)
+    result, = core.ClauseMatcherLogic.match_many([clause], library, False)
+    assert result.matched_reg == "REG-2025"
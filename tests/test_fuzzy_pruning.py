@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+模糊匹配剪枝等价性：FUZZY_PRUNING 开 / 关（均在 FUZZY_BRUTE_FORCE 下逐条全量比对）的 MatchResult 必须逐字段一致。
+输入为两份样本文档的全部条款，以及由条款库名称与正文随机删改、截断得到的条款（完整内容与纯标题两种模式）。
+"""
+
+import random
+
+import pytest
+
+from benchmarks.common import SAMPLE_DOCUMENTS, diff_results, edit
+
+
+def random_clauses(core, library, count: int, seed: int):
+    rng = random.Random(seed)
+    clauses = []
+    for _ in range(count):
+        i = rng.randrange(len(library))
+        ratio = rng.choice((0.0, 0.1, 0.3, 0.6))
+        # 少量标题与正文来自不同条目，制造得分接近的候选
+        content = library.contents[i if rng.random() < 0.8 else rng.randrange(len(library))]
+        clauses.append(core.ClauseItem(edit(library.names[i], rng, ratio, truncate=0.3),
+                                       edit(content, rng, ratio, truncate=0.3)))
+    return clauses
+
+
+@pytest.mark.parametrize("case", SAMPLE_DOCUMENTS + ("random", "random-title-only"))
+def test_pruning_keeps_results(core, library, documents, monkeypatch, case):
+    if case in documents:
+        clauses, is_title_only = documents[case]
+    else:
+        is_title_only = case == "random-title-only"
+        clauses = random_clauses(core, library, 100, seed=is_title_only)
+    monkeypatch.setattr(core.ClauseConfig, "FUZZY_BRUTE_FORCE", True)
+    results = {}
+    for pruning in (False, True):
+        monkeypatch.setattr(core.ClauseConfig, "FUZZY_PRUNING", pruning)
+        results[pruning] = core.ClauseMatcherLogic.match_many(clauses, library, is_title_only)
+    assert diff_results(results[False], results[True], case) == []
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+进程池匹配一致性：各启动方式（spawn / fork）下的 match_many 与串行结果逐字段一致（含 alternatives、candidates_scored）。
+先改动若干 ClauseConfig 参数，确认工作进程按父进程的配置匹配，而不是重新导入模块后的默认值（spawn 下的陷阱）。
+"""
+
+import multiprocessing
+
+from benchmarks.common import diff_results
+
+# 与默认值不同的配置：影响候选集合与备选条数
+OVERRIDES = {
+    "FUZZY_BRUTE_FORCE": True,
+    "MATCH_ALTERNATIVES": 6,
+    "FUZZY_CANDIDATE_LIMIT": 20,
+}
+
+
+def test_pool_matches_serial(core, library, documents, monkeypatch):
+    logic = core.ClauseMatcherLogic
+    for name, value in OVERRIDES.items():
+        assert getattr(core.ClauseConfig, name) != value, f"{name} 的默认值已是 {value!r}，起不到校验作用"
+        monkeypatch.setattr(core.ClauseConfig, name, value)
+    serial = {doc: logic.match_many(clauses, library, is_title_only)
+              for doc, (clauses, is_title_only) in documents.items()}
+    
+    failures = []
+    for method in ("spawn", "fork"):
+        if method not in multiprocessing.get_all_start_methods():
+            continue
+        with logic.match_pool(library, 2, multiprocessing.get_context(method)) as pool:
+            for doc, (clauses, is_title_only) in documents.items():
+                parallel = logic.match_many(clauses, library, is_title_only, pool=pool)
+                failures += diff_results(serial[doc], parallel, f"{doc} [{method}]")
+    assert failures == []
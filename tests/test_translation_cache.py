@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""翻译缓存：命中时间暂存到 flush 才写入，淘汰按批进行且仍按最近使用顺序"""
+
+import itertools
+
+import pytest
+
+
+@pytest.fixture
+def cache(core, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(core.time, "time", lambda: float(next(clock)))
+    cache = core.TranslationCache(":memory:", max_entries=3)
+    yield cache
+    cache.close()
+
+
+def last_used(cache, text):
+    return cache._conn.execute(
+        "SELECT last_used FROM translations WHERE source=?", (text,)).fetchone()[0]
+
+
+def test_hits_are_written_on_flush(cache):
+    cache.put("fire", "google", "zh-CN", "火灾")
+    inserted = last_used(cache, "fire")
+    assert cache.get(" fire ", "google", "zh-CN") == "火灾"
+    assert last_used(cache, "fire") == inserted
+    cache.flush()
+    assert last_used(cache, "fire") > inserted
+
+
+def test_eviction_is_batched_and_least_recent_first(cache):
+    for text in ("a", "b", "c", "d", "e"):
+        cache.put(text, "google", "zh-CN", text.upper())
+    assert len(cache) == 5
+    cache.get("a", "google", "zh-CN")
+    cache.flush()
+    assert len(cache) == 3
+    assert [cache.get(t, "google", "zh-CN") for t in "abcde"] == ["A", None, None, "D", "E"]
+
+
+def test_insert_threshold_triggers_eviction(cache, monkeypatch):
+    monkeypatch.setattr(cache, "EVICT_BATCH", 4)
+    for text in ("a", "b", "c"):
+        cache.put(text, "google", "zh-CN", text.upper())
+    cache.put("d", "google", "zh-CN", "D")
+    assert len(cache) == 3
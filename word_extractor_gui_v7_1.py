@@ -20,11 +20,8 @@ from pathlib import Path
 from collections import defaultdict
 import math
 
-# 第三方库
-import pandas as pd
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from docx import Document
+# 第三方库：pandas / openpyxl 在工作线程首次使用时再导入，窗口先显示
+from docx_stream import iter_docx_paragraphs
 
 # PyQt5 库
 from PyQt5.QtWidgets import (
@@ -155,8 +152,7 @@ class WordExtractorProcessor:
                     result['Error'] = "doc格式转换失败"
                     return result
 
-            doc = Document(str(target_path))
-            paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+            paragraphs = [text.strip() for text in iter_docx_paragraphs(target_path) if text.strip()]
 
             if not paragraphs:
                 result['Error'] = '文档内容为空'
@@ -236,6 +232,8 @@ class WordExtractorProcessor:
         return max(height, 30) # 最小30
 
     def save_to_excel(self, data_list: list, output_file: str, format_type: str = 'horizontal'):
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
         wb = openpyxl.Workbook()
         wb.properties.creator = "Alex Jin"
         wb.properties.lastModifiedBy = "Alex Jin"
@@ -344,6 +342,7 @@ class ExtractWorker(QThread):
             return processed_files
         try:
             self.log_signal.emit(f"📖 正在读取历史记录...", "info")
+            import pandas as pd
             xls = pd.read_excel(self.history_path, sheet_name=None, dtype=str)
             count = 0
             for _, df in xls.items():